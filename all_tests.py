@@ -4,94 +4,474 @@ Master test runner for all Poker AI test suites
 Runs: game_test_suite.py, win_probability_test_suite.py, test_bot_ai.py
 """
 
+import argparse
+import importlib
+import importlib.util
+import json
+import os
 import sys
+import tempfile
 import time
-from io import StringIO
-from contextlib import redirect_stdout, redirect_stderr
+import unittest
+import xml.etree.ElementTree as ET
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from types import ModuleType
+from typing import Callable, Dict
 
+TEST_SUITES = [
+    ("game_test_suite", "Game Logic Tests (92 assertions)"),
+    ("win_probability_test_suite", "Win Probability Calculator Tests"),
+    ("test_bot_ai", "Bot AI Decision Tests"),
+]
 
-def run_test_suite(module_name, description):
-    """Run a single test suite and return results"""
-    print(f"\n{'='*70}")
-    print(f"Running: {description}")
-    print(f"Module: {module_name}")
-    print(f"{'='*70}\n")
-    
-    try:
-        # Dynamically import and run the test module
-        if module_name == "game_test_suite":
-            import game_test_suite
-            # Suppress debug output
-            from poker_game import PokerGame
-            PokerGame.DEBUG = False
-        elif module_name == "win_probability_test_suite":
-            import win_probability_test_suite
-        elif module_name == "test_bot_ai":
-            import test_bot_ai
+# Per-test durations from the previous run, used to balance shards
+DURATIONS_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "_durations.json")
+
+# Collected test ids per suite, keyed by source path and mtime
+MANIFEST_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), ".test_cache", "manifest.json")
+
+
+class FDCapture:
+    """Capture everything written to file descriptors 1 and 2.
+
+    Unlike redirect_stdout this also catches output from C code and
+    subprocesses that write to the real descriptors. Output goes to a
+    temporary file rather than a pipe so large outputs cannot block the
+    writer; pass the same file in to reuse it across captures.
+    """
+
+    def __init__(self, capture_file=None):
+        self._file = capture_file
+        self._saved = ()
+        self.output = ""
+
+    def __enter__(self):
+        sys.stdout.flush()
+        sys.stderr.flush()
+        if self._file is None:
+            self._file = tempfile.TemporaryFile()
+        self._file.seek(0)
+        self._file.truncate()
+        self._saved = (os.dup(1), os.dup(2))
+        os.dup2(self._file.fileno(), 1)
+        os.dup2(self._file.fileno(), 2)
+        return self
+
+    def __exit__(self, *exc_info):
+        sys.stdout.flush()
+        sys.stderr.flush()
+        for fd, saved in zip((1, 2), self._saved):
+            os.dup2(saved, fd)
+            os.close(saved)
+        self._file.seek(0)
+        self.output = self._file.read().decode("utf-8", errors="replace")
+        return False
+
+
+def _function_test_case(func):
+    """Wrap a script-style test_* function as a unittest test case.
+
+    The suites' test functions return their GameTester, which records
+    failures instead of raising, so a non-zero failure count is turned
+    into an AssertionError here.
+    """
+    def run():
+        tester = func()
+        failed = getattr(tester, "assertions_failed", 0)
+        if failed:
+            raise AssertionError(f"{failed} assertion(s) failed")
+    # FunctionTestCase.id() is the function name, so make it the full test id
+    run.__name__ = f"{func.__module__}.{func.__name__}"
+    run.__qualname__ = run.__name__
+    return unittest.FunctionTestCase(run)
+
+
+def load_suite(mod):
+    """Collect unittest cases plus the suite's test functions.
+
+    A module-level TESTS registry gives the functions and their order;
+    otherwise module-level test_* functions are used in definition order.
+    """
+    suite = unittest.defaultTestLoader.loadTestsFromModule(mod)
+    tests = getattr(mod, "TESTS", None)
+    if tests is None:
+        tests = [
+            obj for name, obj in vars(mod).items()
+            if name.startswith("test_") and callable(obj) and getattr(obj, "__module__", None) == mod.__name__
+        ]
+    for func in tests:
+        suite.addTest(_function_test_case(func))
+    return suite
+
+
+def _iter_tests(suite):
+    """Flatten a (possibly nested) TestSuite into individual test cases"""
+    for test in suite:
+        if isinstance(test, unittest.TestSuite):
+            yield from _iter_tests(test)
         else:
-            print(f"❌ Unknown module: {module_name}")
-            return False
-        
-        print(f"✓ {description} completed successfully\n")
-        return True
+            yield test
+
+
+def _setup_game(mod):
+    """Suppress debug output (the suite has already imported poker_game)"""
+    poker_game = sys.modules.get("poker_game") or importlib.import_module("poker_game")
+    poker_game.PokerGame.DEBUG = False
+
+
+def _setup_wp(mod):
+    """No extra setup needed for the win probability suite"""
+
+
+def _setup_bot(mod):
+    """No extra setup needed for the bot AI suite"""
+
+
+# Known suite modules and the setup to run after importing each one
+_SUITE_DISPATCH: Dict[str, Callable[[ModuleType], None]] = {
+    "game_test_suite": _setup_game,
+    "win_probability_test_suite": _setup_wp,
+    "test_bot_ai": _setup_bot,
+}
+
+
+# Suite modules imported by main() before forking, which workers inherit
+_MODS: Dict[str, ModuleType] = {}
+
+
+def prewarm_suite(module_name):
+    """Import a suite into _MODS (errors propagate to the caller)"""
+    if module_name not in _MODS:
+        _MODS[module_name] = importlib.import_module(module_name)
+
+
+def import_suite(module_name):
+    """Import a test suite module and prepare it for running"""
+    setup = _SUITE_DISPATCH.get(module_name)
+    if setup is None:
+        return None
+    mod = _MODS.get(module_name)
+    if mod is None:
+        mod = importlib.import_module(module_name)
+    setup(mod)
+    return mod
+
+
+def collect_test_ids(module_name):
+    """Return the ids of all tests in a suite, or None for an unknown module"""
+    mod = import_suite(module_name)
+    if mod is None:
+        return None
+    return [test.id() for test in _iter_tests(load_suite(mod))]
+
+
+def _suite_stamp(module_name):
+    """Return (path, mtime_ns) of a suite's source file without importing it"""
+    spec = importlib.util.find_spec(module_name)
+    if spec is None or not spec.origin or not os.path.isfile(spec.origin):
+        return None
+    return spec.origin, os.stat(spec.origin).st_mtime_ns
+
+
+def load_manifest():
+    """Load the cached test manifest"""
+    try:
+        with open(MANIFEST_PATH) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def save_manifest(manifest):
+    """Write the test manifest atomically"""
+    try:
+        os.makedirs(os.path.dirname(MANIFEST_PATH), exist_ok=True)
+        tmp_path = MANIFEST_PATH + ".tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(manifest, f, indent=2, sort_keys=True)
+        os.replace(tmp_path, MANIFEST_PATH)
+    except OSError as e:
+        print(f"⚠️  Could not save test manifest: {e}")
+
+
+def cached_test_ids(manifest, module_name):
+    """Return the suite's test ids from the manifest if its source is unchanged"""
+    stamp = _suite_stamp(module_name)
+    entry = manifest.get(module_name)
+    if stamp is None or entry is None:
+        return None
+    if (entry["path"], entry["mtime_ns"]) != stamp:
+        return None
+    return entry["tests"]
+
+
+def _run_test(test_id, tests_by_id, show_traceback=False):
+    """Run a single test by id and return whether it passed"""
+    try:
+        module_name = test_id.split(".", 1)[0]
+        if module_name not in tests_by_id:
+            mod = import_suite(module_name)
+            tests_by_id[module_name] = {test.id(): test for test in _iter_tests(load_suite(mod))}
+        test = tests_by_id[module_name][test_id]
+
+        result = unittest.TestResult()
+        test.run(result)
+        for failed_test, trace in result.failures + result.errors:
+            print(f"❌ {failed_test.id()}:\n{trace}")
+        return result.wasSuccessful()
     except Exception as e:
-        print(f"❌ {description} failed with error:")
+        print(f"❌ {test_id} failed with error:")
         print(f"   {type(e).__name__}: {e}\n")
-        import traceback
-        traceback.print_exc()
+        if show_traceback:
+            import traceback
+            traceback.print_exc()
         return False
 
 
-def main():
+def run_test_shard(test_ids, show_traceback=False):
+    """Run a shard of tests in a worker and return [(test_id, passed, elapsed, output)]"""
+    tests_by_id = {}
+    results = []
+    with tempfile.TemporaryFile() as capture_file:
+        for test_id in test_ids:
+            start = time.perf_counter()
+            with FDCapture(capture_file) as capture:
+                passed = _run_test(test_id, tests_by_id, show_traceback)
+            results.append((test_id, passed, time.perf_counter() - start, capture.output))
+    return results
+
+
+def _workers():
+    """Number of test workers: usable cores minus two, but at least one.
+
+    sched_getaffinity respects CPU limits placed on the process (e.g. in
+    CI containers), where cpu_count reports every core on the host.
+    """
+    try:
+        n = len(os.sched_getaffinity(0))
+    except AttributeError:
+        n = os.cpu_count() or 2
+    return max(1, n - 2)
+
+
+def load_durations():
+    """Load per-test durations recorded by the previous run"""
+    try:
+        with open(DURATIONS_PATH) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def save_durations(durations):
+    """Record per-test durations for the next run's shard balancing"""
+    try:
+        with open(DURATIONS_PATH, "w") as f:
+            json.dump(durations, f, indent=2, sort_keys=True)
+    except OSError as e:
+        print(f"⚠️  Could not save test durations: {e}")
+
+
+def pack_shards(test_ids, durations, num_shards):
+    """Split tests into balanced shards.
+
+    Uses the longest-processing-time-first heuristic on recorded durations
+    (unknown tests are assumed to take the average), or round-robin when
+    no durations have been recorded yet.
+    """
+    num_shards = max(1, min(num_shards, len(test_ids)))
+    shards = [[] for _ in range(num_shards)]
+    known = [durations[t] for t in test_ids if t in durations]
+    if not known:
+        for i, test_id in enumerate(test_ids):
+            shards[i % num_shards].append(test_id)
+        return shards
+
+    default = sum(known) / len(known)
+    loads = [0.0] * num_shards
+    for test_id in sorted(test_ids, key=lambda t: durations.get(t, default), reverse=True):
+        i = loads.index(min(loads))
+        shards[i].append(test_id)
+        loads[i] += durations.get(test_id, default)
+    return shards
+
+
+def write_junit_xml(path, suite_tests, test_results, durations):
+    """Write per-test results and durations as a JUnit XML report"""
+    root = ET.Element("testsuites")
+    for description, test_ids in suite_tests.items():
+        failures = sum(1 for test_id in test_ids if not test_results[test_id][0])
+        suite_time = sum(durations.get(test_id, 0.0) for test_id in test_ids)
+        suite = ET.SubElement(root, "testsuite", name=description, tests=str(len(test_ids)),
+                              failures=str(failures), time=f"{suite_time:.3f}")
+        for test_id in test_ids:
+            passed, output = test_results[test_id]
+            classname, name = test_id.rsplit(".", 1)
+            case = ET.SubElement(suite, "testcase", classname=classname, name=name,
+                                 time=f"{durations.get(test_id, 0.0):.3f}")
+            if not passed:
+                ET.SubElement(case, "failure", message="test failed").text = output
+            elif output:
+                ET.SubElement(case, "system-out").text = output
+    try:
+        ET.ElementTree(root).write(path, encoding="utf-8", xml_declaration=True)
+    except OSError as e:
+        print(f"⚠️  Could not write JUnit XML report: {e}")
+
+
+def parse_args(argv=None):
+    """Parse command line options"""
+    parser = argparse.ArgumentParser(description="Run all Poker AI test suites")
+    parser.add_argument("--junit-xml", metavar="PATH",
+                        help="write per-test results and durations as JUnit XML to PATH")
+    parser.add_argument("--tb", action="store_true",
+                        help="print full tracebacks for errors outside test assertions")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
     """Run all test suites and report results"""
+    args = parse_args(argv)
     print("\n" + "="*70)
     print("POKER AI - COMPREHENSIVE TEST SUITE")
     print("="*70)
     print(f"Start time: {time.strftime('%Y-%m-%d %H:%M:%S')}\n")
-    
-    test_suites = [
-        ("game_test_suite", "Game Logic Tests (92 assertions)"),
-        ("win_probability_test_suite", "Win Probability Calculator Tests"),
-        ("test_bot_ai", "Bot AI Decision Tests"),
-    ]
-    
+
+    test_suites = TEST_SUITES
+
     results = {}
-    start_time = time.time()
-    
+    tests_run = {}
+    suite_tests = {}
+    collect_errors = {}
+    start_ns = time.perf_counter_ns()
+
+    # Collect individual tests so they can be sharded across workers;
+    # suites whose source is unchanged reuse the cached manifest
+    manifest = load_manifest()
+    manifest_changed = False
     for module_name, description in test_suites:
+        messages = []
         try:
-            results[description] = run_test_suite(module_name, description)
+            test_ids = cached_test_ids(manifest, module_name)
+            if test_ids is None:
+                capture = FDCapture()
+                try:
+                    with capture:
+                        test_ids = collect_test_ids(module_name)
+                finally:
+                    messages.append(capture.output)
+                stamp = _suite_stamp(module_name)
+                if test_ids is not None and stamp is not None:
+                    manifest[module_name] = {"path": stamp[0], "mtime_ns": stamp[1], "tests": test_ids}
+                    manifest_changed = True
+            if test_ids is None:
+                messages.append(f"❌ Unknown module: {module_name}\n")
+                results[description] = False
+            else:
+                suite_tests[description] = test_ids
         except ImportError as e:
-            print(f"⚠️  Skipping {module_name}: {e}\n")
+            messages.append(f"⚠️  Skipping {module_name}: {e}\n")
             results[description] = None
-    
-    elapsed_time = time.time() - start_time
-    
-    # Print summary
-    print("\n" + "="*70)
-    print("TEST SUMMARY")
-    print("="*70)
-    
-    passed = sum(1 for r in results.values() if r is True)
-    failed = sum(1 for r in results.values() if r is False)
-    skipped = sum(1 for r in results.values() if r is None)
-    total = len(results)
-    
-    for description, result in results.items():
-        if result is True:
-            status = "✓ PASSED"
-        elif result is False:
-            status = "✗ FAILED"
+        except Exception as e:
+            messages.append(f"❌ {description} failed with error:\n")
+            messages.append(f"   {type(e).__name__}: {e}\n")
+            if args.tb:
+                import traceback
+                messages.append(traceback.format_exc())
+            results[description] = False
+        collect_errors[description] = "".join(messages)
+    if manifest_changed:
+        save_manifest(manifest)
+
+    # Import the suites that will run once here, so forked workers inherit them
+    for module_name, description in test_suites:
+        if description not in suite_tests:
+            continue
+        try:
+            prewarm_suite(module_name)
+        except ImportError as e:
+            collect_errors[description] += f"⚠️  Skipping {module_name}: {e}\n"
+            del suite_tests[description]
+            results[description] = None
+        except Exception as e:
+            collect_errors[description] += f"❌ {description} failed with error:\n   {type(e).__name__}: {e}\n"
+            if args.tb:
+                import traceback
+                collect_errors[description] += traceback.format_exc()
+            del suite_tests[description]
+            results[description] = False
+
+    # Pack tests into balanced shards, one per worker (leave two cores free)
+    all_test_ids = [test_id for test_ids in suite_tests.values() for test_id in test_ids]
+    durations = load_durations()
+    shards = pack_shards(all_test_ids, durations, _workers()) if all_test_ids else []
+
+    test_results = {}
+    if shards:
+        with ProcessPoolExecutor(max_workers=len(shards)) as executor:
+            futures = [executor.submit(run_test_shard, shard, args.tb) for shard in shards]
+            for future in as_completed(futures):
+                for test_id, passed, elapsed, output in future.result():
+                    test_results[test_id] = (passed, output)
+                    durations[test_id] = elapsed
+    save_durations(durations)
+    if args.junit_xml:
+        write_junit_xml(args.junit_xml, suite_tests, test_results, durations)
+
+    # Print captured output in suite order
+    for module_name, description in test_suites:
+        print(f"\n{'='*70}")
+        print(f"Running: {description}")
+        print(f"Module: {module_name}")
+        print(f"{'='*70}\n")
+        print(collect_errors[description], end="")
+        if description not in suite_tests:
+            tests_run[description] = 0
+            continue
+
+        test_ids = suite_tests[description]
+        for test_id in test_ids:
+            print(test_results[test_id][1], end="")
+        tests_run[description] = len(test_ids)
+        num_failed = sum(1 for test_id in test_ids if not test_results[test_id][0])
+
+        if not test_ids:
+            print(f"❌ {description} ran no tests\n")
+            results[description] = False
+        elif num_failed:
+            print(f"❌ {description} failed ({num_failed} of {len(test_ids)} tests)\n")
+            results[description] = False
         else:
-            status = "⊘ SKIPPED"
-        print(f"{status:12} | {description}")
-    
-    print("="*70)
-    print(f"Total: {total} | Passed: {passed} | Failed: {failed} | Skipped: {skipped}")
-    print(f"Elapsed time: {elapsed_time:.2f} seconds")
-    print(f"End time: {time.strftime('%Y-%m-%d %H:%M:%S')}")
-    print("="*70 + "\n")
-    
+            print(f"✓ {description} completed successfully ({len(test_ids)} tests)\n")
+            results[description] = True
+    results = {description: results[description] for _, description in test_suites}
+
+    elapsed_time = (time.perf_counter_ns() - start_ns) / 1e9
+
+    counts = Counter(results.values())
+    passed, failed, skipped = counts[True], counts[False], counts[None]
+    total = len(results)
+    end_ts = time.strftime('%Y-%m-%d %H:%M:%S')
+
+    # Print summary in a single write
+    status_labels = {True: "✓ PASSED", False: "✗ FAILED", None: "⊘ SKIPPED"}
+    lines = ["", "="*70, "TEST SUMMARY", "="*70]
+    lines.extend(
+        f"{status_labels[result]:12} | {description} ({tests_run[description]} tests)"
+        for description, result in results.items()
+    )
+    lines.extend([
+        "="*70,
+        f"Total: {total} | Passed: {passed} | Failed: {failed} | Skipped: {skipped}",
+        f"Elapsed time: {elapsed_time:.2f} seconds",
+        f"End time: {end_ts}",
+        "="*70,
+        "",
+    ])
+    sys.stdout.write("\n".join(lines) + "\n")
+    sys.stdout.flush()
+
     # Exit with appropriate code
     if failed > 0:
         sys.exit(1)
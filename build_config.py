@@ -0,0 +1,52 @@
+#!/usr/bin/env python3
+"""
+Optional build step: compile modules into C extensions with mypyc
+
+Run `python build_config.py` (requires `pip install mypy`). By default this
+compiles config.py, poker_bot.py (the bot decision path, where mypyc
+removes the attribute lookups and float boxing in _make_decision),
+hand_eval.py (the table-lookup hand evaluators, the inner loop of every
+equity simulation) and win_probability.py (the Monte Carlo run-out
+sampling and ranking loop around them); pass
+file names to compile something else, e.g. `python build_config.py config.py`.
+Each module gets a <name>.cpython-*.so next to its source. Python's import
+system picks an extension module over the .py source in the same directory,
+so the compiled version is loaded with no code changes, and the .py file
+stays the fallback when nothing has been built.
+
+Remember to rebuild (or delete the .so) after editing a compiled module,
+otherwise the old compiled code keeps being used.
+"""
+
+import glob
+import importlib.util
+import os
+import subprocess
+import sys
+
+DEFAULT_MODULES = ["config.py", "poker_bot.py", "hand_eval.py", "win_probability.py"]
+
+
+def main(argv=None):
+    """Compile the given modules (default DEFAULT_MODULES) with mypyc and report the built extensions"""
+    modules = list(argv if argv is not None else sys.argv[1:]) or DEFAULT_MODULES
+    if importlib.util.find_spec("mypyc") is None:
+        print(f"✗ mypyc is not installed (pip install mypy); {', '.join(modules)} will be used as-is")
+        return 1
+
+    here = os.path.dirname(os.path.abspath(__file__))
+    result = subprocess.run([sys.executable, "-m", "mypyc", *modules], cwd=here)
+    if result.returncode != 0:
+        print(f"✗ mypyc failed; {', '.join(modules)} will be used as-is")
+        return result.returncode
+
+    built = []
+    for module in modules:
+        name = os.path.splitext(module)[0]
+        built += glob.glob(os.path.join(here, f"{name}.*.so")) + glob.glob(os.path.join(here, f"{name}.*.pyd"))
+    print(f"✓ Built {', '.join(os.path.basename(path) for path in built)}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -2,35 +2,100 @@
 Configuration constants for Poker AI application
 """
 
-# UI Configuration
-UI_WINDOW_WIDTH = 1200
-UI_WINDOW_HEIGHT = 900
-UI_BG_COLOR = "#2d5016"
-UI_CARD_SIZE = 100  # pixels
-
-# Game Configuration
-DEFAULT_NUM_OPPONENTS = 2
-DEFAULT_STARTING_STACK = 1000
-DEFAULT_BIG_BLIND = 10
-DEFAULT_SMALL_BLIND = 5
-
-# AI Configuration
-DEFAULT_AI_DELAY = 0.1  # seconds between AI moves
-MAX_AI_DELAY = 5.0  # seconds
-MIN_AI_DELAY = 0.0  # seconds
-AI_DELAY_INCREMENT = 0.1
-
-# Win Probability Calculation
-NUM_SIMULATIONS_SETUP = 5000  # simulations during gameplay
-NUM_SIMULATIONS_SETUP_SCREEN = 10000  # simulations for info/testing
-
-# Game Strategy
-DEFAULT_BOT_TYPE = "TAG"  # Tight-Aggressive
-
-# UI Appearance
-CARD_IMAGE_FORMAT = ".png"
-CARDS_DIRECTORY = "cards-png-100px"
-
-# Debug/Logging
-ENABLE_DEBUG = False  # Set to True for verbose output
-ENABLE_PERFORMANCE_LOGGING = False  # Log performance metrics
+from dataclasses import dataclass
+
+
+@dataclass(frozen=True)
+class _Config:
+    """Immutable settings shared by the game, bots and UI"""
+
+    # UI Configuration
+    UI_WINDOW_WIDTH: int = 1200
+    UI_WINDOW_HEIGHT: int = 900
+    UI_BG_COLOR: str = "#2d5016"
+    UI_CARD_SIZE: int = 100  # pixels
+    UI_CARD_HEIGHT: int = 146  # pixels (card images are scaled to fit UI_CARD_SIZE x UI_CARD_HEIGHT)
+    UI_CARD_BACK_COLOR: str = "#1f3b7a"  # Placeholder shown in card slots with no card
+
+    # Game Configuration
+    DEFAULT_NUM_OPPONENTS: int = 2
+    DEFAULT_STARTING_STACK: int = 1000
+    DEFAULT_BIG_BLIND: int = 10
+    DEFAULT_SMALL_BLIND: int = 5
+
+    # AI Configuration
+    DEFAULT_AI_DELAY: float = 0.1  # seconds between AI moves
+    MAX_AI_DELAY: float = 5.0  # seconds
+    MIN_AI_DELAY: float = 0.0  # seconds
+    AI_DELAY_INCREMENT: float = 0.1
+    DEFAULT_AI_DELAY_NS: int = 100_000_000  # Same delays as integer nanoseconds
+    MAX_AI_DELAY_NS: int = 5_000_000_000
+    MIN_AI_DELAY_NS: int = 0
+    AI_DELAY_INCREMENT_NS: int = 100_000_000
+
+    # Win Probability Calculation
+    NUM_SIMULATIONS_SETUP: int = 5000  # simulations during gameplay
+    NUM_SIMULATIONS_SETUP_SCREEN: int = 10000  # simulations for info/testing
+    NUM_SIMULATIONS_BOT: int = 1000  # simulations per bot decision
+    BOT_EQUITY_CACHE_SIZE: int = 1024  # Equities each bot remembers within one hand
+    EQUITY_CACHE_SIZE: int = 8192  # UI equity results kept per canonical (hole, board, opponents)
+    EQUITY_POLL_INTERVAL_MS: int = 50  # How often the UI checks for a finished background equity result
+    EQUITY_PROCESSES: int = 0  # Processes sharing each UI equity simulation (0: CPU count - 1; below 2 runs in-thread)
+    CARD_TYPECODE: str = "B"  # array typecode for card indices (uint8, 0-51)
+    HAND_RANK_TYPECODE: str = "H"  # array typecode for hand rank tables (uint16, 1-7462)
+    HAND_TABLE_CACHE_PATH: str = ".hand_tables_cache.pkl"  # Built hand rank tables (next to hand_eval.py)
+
+    # Game Strategy
+    DEFAULT_BOT_TYPE: str = "TAG"  # Tight-Aggressive
+
+    # UI Appearance
+    CARD_IMAGE_FORMAT: str = ".png"
+    CARDS_DIRECTORY: str = "cards-png-100px"
+    CARD_IMAGE_PRELOAD: bool = True  # Decode all card images once and cache the pixels
+    CARD_IMAGE_CACHE_PATH: str = ".cards_cache.pkl"  # Decoded card cache (next to poker_ui.py)
+    CARD_PHOTO_CACHE_SIZE: int = 16  # Card PhotoImages kept alive (about 7 are on screen at once)
+
+    # Debug/Logging
+    ENABLE_DEBUG: bool = False  # Set to True for verbose output
+    ENABLE_PERFORMANCE_LOGGING: bool = False  # Log performance metrics
+
+
+CONFIG = _Config()
+
+# Module-level aliases so `from config import NAME` keeps working
+UI_WINDOW_WIDTH = CONFIG.UI_WINDOW_WIDTH
+UI_WINDOW_HEIGHT = CONFIG.UI_WINDOW_HEIGHT
+UI_BG_COLOR = CONFIG.UI_BG_COLOR
+UI_CARD_SIZE = CONFIG.UI_CARD_SIZE
+UI_CARD_HEIGHT = CONFIG.UI_CARD_HEIGHT
+UI_CARD_BACK_COLOR = CONFIG.UI_CARD_BACK_COLOR
+DEFAULT_NUM_OPPONENTS = CONFIG.DEFAULT_NUM_OPPONENTS
+DEFAULT_STARTING_STACK = CONFIG.DEFAULT_STARTING_STACK
+DEFAULT_BIG_BLIND = CONFIG.DEFAULT_BIG_BLIND
+DEFAULT_SMALL_BLIND = CONFIG.DEFAULT_SMALL_BLIND
+DEFAULT_AI_DELAY = CONFIG.DEFAULT_AI_DELAY
+MAX_AI_DELAY = CONFIG.MAX_AI_DELAY
+MIN_AI_DELAY = CONFIG.MIN_AI_DELAY
+AI_DELAY_INCREMENT = CONFIG.AI_DELAY_INCREMENT
+DEFAULT_AI_DELAY_NS = CONFIG.DEFAULT_AI_DELAY_NS
+MAX_AI_DELAY_NS = CONFIG.MAX_AI_DELAY_NS
+MIN_AI_DELAY_NS = CONFIG.MIN_AI_DELAY_NS
+AI_DELAY_INCREMENT_NS = CONFIG.AI_DELAY_INCREMENT_NS
+NUM_SIMULATIONS_SETUP = CONFIG.NUM_SIMULATIONS_SETUP
+NUM_SIMULATIONS_SETUP_SCREEN = CONFIG.NUM_SIMULATIONS_SETUP_SCREEN
+NUM_SIMULATIONS_BOT = CONFIG.NUM_SIMULATIONS_BOT
+BOT_EQUITY_CACHE_SIZE = CONFIG.BOT_EQUITY_CACHE_SIZE
+EQUITY_CACHE_SIZE = CONFIG.EQUITY_CACHE_SIZE
+EQUITY_POLL_INTERVAL_MS = CONFIG.EQUITY_POLL_INTERVAL_MS
+EQUITY_PROCESSES = CONFIG.EQUITY_PROCESSES
+CARD_TYPECODE = CONFIG.CARD_TYPECODE
+HAND_RANK_TYPECODE = CONFIG.HAND_RANK_TYPECODE
+HAND_TABLE_CACHE_PATH = CONFIG.HAND_TABLE_CACHE_PATH
+DEFAULT_BOT_TYPE = CONFIG.DEFAULT_BOT_TYPE
+CARD_IMAGE_FORMAT = CONFIG.CARD_IMAGE_FORMAT
+CARDS_DIRECTORY = CONFIG.CARDS_DIRECTORY
+CARD_IMAGE_PRELOAD = CONFIG.CARD_IMAGE_PRELOAD
+CARD_IMAGE_CACHE_PATH = CONFIG.CARD_IMAGE_CACHE_PATH
+CARD_PHOTO_CACHE_SIZE = CONFIG.CARD_PHOTO_CACHE_SIZE
+ENABLE_DEBUG = CONFIG.ENABLE_DEBUG
+ENABLE_PERFORMANCE_LOGGING = CONFIG.ENABLE_PERFORMANCE_LOGGING
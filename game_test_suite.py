@@ -1,14 +1,72 @@
+import copy
 import random
-from typing import List, Dict, Any, Optional, Callable
-from poker_game import PokerGame, Card, Deck, Player, HandEvaluator
+from array import array
+from functools import lru_cache
+from typing import List, Dict, Any, Optional, Callable, Tuple
+from poker_game import (
+    PokerGame, Card, Player, HandEvaluator, evaluate5, evaluate5_batch, evaluate_texas_cards,
+    CATEGORY_OF_RANK, HAND_NAMES, cards_to_mask, evaluate_mask
+)
+
+
+_SUIT_NAMES = {'H': 'Hearts', 'D': 'Diamonds', 'C': 'Clubs', 'S': 'Spades'}
+
+# Character code of a suit letter (either case) -> suit name, None for anything else
+_SUIT_LUT: List[Optional[str]] = [None] * 256
+for _suit_char, _suit in _SUIT_NAMES.items():
+    _SUIT_LUT[ord(_suit_char)] = _SUIT_LUT[ord(_suit_char.lower())] = _suit
+del _suit_char, _suit
+
+# All 52 legal card strings ('AS', '10h', ...) mapped to a shared Card
+_CARD_CACHE: Dict[str, Card] = {
+    rank + suit_char: Card(suit, rank)
+    for rank in Card.RANKS for suit_char, suit in _SUIT_NAMES.items()
+}
+_CARD_CACHE.update({card_str[:-1] + card_str[-1].lower(): card for card_str, card in list(_CARD_CACHE.items())})
+
+# Same table mapped straight to Cactus-Kev ints for evaluate5
+_CK_CACHE: Dict[str, int] = {card_str: card.ck_int for card_str, card in _CARD_CACHE.items()}
+
+
+def _parse_card(card_str: str) -> Card:
+    """Parse card string like 'AS', '2H', '10D' into Card object"""
+    card = _CARD_CACHE.get(card_str)
+    if card is not None:
+        return card
+    
+    # Not a legal card string; report what is wrong with it
+    if len(card_str) < 2:
+        raise ValueError(f"Invalid card string: {card_str}")
+    code = ord(card_str[-1])
+    suit = _SUIT_LUT[code] if code < 256 else None
+    if suit is None:
+        raise ValueError(f"Invalid suit: {card_str[-1].upper()}")
+    return Card(suit, card_str[:-1])
+
+
+# Betting round name (as passed to GameScript.add_action) -> round id
+_STAGE_ID = {"pre-flop": 0, "flop": 1, "turn": 2, "river": 3}
 
 
 class GameScriptAction:
     """Represents a player action in a scripted game"""
+    __slots__ = ('player_id', 'action_id', 'amount')
+    
+    # Actions are stored as their index in this tuple
+    _ACTION_NAMES = ("check", "call", "raise", "fold", "all-in")
+    _ACTION_IDS = {name: i for i, name in enumerate(_ACTION_NAMES)}
+    
     def __init__(self, player_id: int, action: str, amount: Optional[int] = None):
+        if action not in self._ACTION_IDS:
+            raise ValueError(f"Invalid action: {action}")
         self.player_id = player_id
-        self.action = action  # "check", "call", "raise", "fold", "all-in"
+        self.action_id = self._ACTION_IDS[action]
         self.amount = amount  # For raises
+    
+    @property
+    def action(self) -> str:
+        """Action name (one of _ACTION_NAMES)"""
+        return self._ACTION_NAMES[self.action_id]
 
 
 class GameScript:
@@ -18,44 +76,70 @@ class GameScript:
         self.starting_stack = starting_stack
         self.hole_cards: Dict[int, List[Card]] = {}  # player_id -> cards
         self.community_cards: List[Card] = []
-        self.actions_by_round: Dict[str, List[GameScriptAction]] = {
-            "pre-flop": [],
-            "flop": [],
-            "turn": [],
-            "river": []
-        }
+        # The same cards as 52-bit card-set masks (Card.mask bits)
+        self.hole_mask: Dict[int, int] = {}
+        self.community_mask: int = 0
+        self._stage_cards: Dict[str, Tuple[Card, ...]] = {}  # Round name -> board for that round
+        # Scripted actions per round as parallel arrays: player id,
+        # action id (GameScriptAction._ACTION_NAMES index), amount (-1 = none)
+        self._player_ids: Dict[str, array] = {round_name: array('b') for round_name in _STAGE_ID}
+        self._action_ids: Dict[str, array] = {round_name: array('b') for round_name in _STAGE_ID}
+        self._amounts: Dict[str, array] = {round_name: array('i') for round_name in _STAGE_ID}
+        # (round id, player id) -> first scripted action, for O(1) lookup
+        self._action_map: Dict[Tuple[int, int], str] = {}
     
     def set_hole_cards(self, player_id: int, cards: List[Card]):
         """Set hole cards for a specific player"""
         if len(cards) != 2:
             raise ValueError("Hole cards must be exactly 2 cards")
+        mask = cards_to_mask(cards)
+        if bin(mask).count("1") != 2:
+            raise ValueError("Hole cards must be 2 different cards")
         self.hole_cards[player_id] = cards
+        self.hole_mask[player_id] = mask
     
     def set_community_cards(self, cards: List[Card]):
         """Set community cards (flop=3, turn=1, river=1)"""
         if len(cards) not in [3, 4, 5]:
             raise ValueError("Community cards must be 3 (flop), 4 (turn), or 5 (river)")
+        mask = cards_to_mask(cards)
+        if bin(mask).count("1") != len(cards):
+            raise ValueError("Community cards must all be different")
         self.community_cards = cards
+        self.community_mask = mask
+        self._stage_cards = {
+            round_name: tuple(cards[:size])
+            for round_name, size in (("Flop", 3), ("Turn", 4), ("River", 5))
+            if len(cards) >= size
+        }
+    
+    @property
+    def actions_by_round(self) -> Dict[str, List[GameScriptAction]]:
+        """Scripted actions per round, rebuilt from the action arrays"""
+        names = GameScriptAction._ACTION_NAMES
+        return {
+            round_name: [
+                GameScriptAction(player_id, names[action_id], None if amount < 0 else amount)
+                for player_id, action_id, amount in zip(
+                    self._player_ids[round_name], self._action_ids[round_name], self._amounts[round_name]
+                )
+            ]
+            for round_name in _STAGE_ID
+        }
     
     def add_action(self, round_name: str, player_id: int, action: str, amount: Optional[int] = None):
         """Add an action for a betting round"""
-        if round_name not in self.actions_by_round:
+        if round_name not in _STAGE_ID:
             raise ValueError(f"Invalid round: {round_name}")
-        self.actions_by_round[round_name].append(GameScriptAction(player_id, action, amount))
+        action_obj = GameScriptAction(player_id, action, amount)
+        self._player_ids[round_name].append(player_id)
+        self._action_ids[round_name].append(action_obj.action_id)
+        self._amounts[round_name].append(-1 if amount is None else amount)
+        self._action_map.setdefault((_STAGE_ID[round_name], player_id), action_obj.action)
     
     def parse_cards(self, card_str: str) -> Card:
         """Parse card string like 'AS', '2H', '10D' into Card object"""
-        if len(card_str) < 2:
-            raise ValueError(f"Invalid card string: {card_str}")
-        
-        rank = card_str[:-1]
-        suit_char = card_str[-1].upper()
-        
-        suit_map = {'H': 'Hearts', 'D': 'Diamonds', 'C': 'Clubs', 'S': 'Spades'}
-        if suit_char not in suit_map:
-            raise ValueError(f"Invalid suit: {suit_char}")
-        
-        return Card(suit_map[suit_char], rank)
+        return _parse_card(card_str)
 
 
 class MockPokerGame(PokerGame):
@@ -70,6 +154,7 @@ class MockPokerGame(PokerGame):
         self.script = script
         self.action_index = 0
         self.current_round = None
+        self._current_round_lc = None  # current_round lowercased, as used in GameScript
     
     def deal_hole_cards(self):
         """Override to use scripted cards if available"""
@@ -83,17 +168,9 @@ class MockPokerGame(PokerGame):
     
     def override_community_cards(self, round_name: str):
         """Set community cards based on script for a given round"""
-        if self.script.community_cards:
-            flop_size = 3
-            turn_size = 4
-            river_size = 5
-            
-            if round_name == "Flop" and len(self.script.community_cards) >= flop_size:
-                self.community_cards = self.script.community_cards[:flop_size]
-            elif round_name == "Turn" and len(self.script.community_cards) >= turn_size:
-                self.community_cards = self.script.community_cards[:turn_size]
-            elif round_name == "River" and len(self.script.community_cards) >= river_size:
-                self.community_cards = self.script.community_cards[:river_size]
+        cards = self.script._stage_cards.get(round_name)
+        if cards:
+            self.community_cards = list(cards)  # PokerGame extends the board in place
     
     def ai_decision(self, player, community_cards, current_bet, to_call):
         """Override to use scripted actions"""
@@ -101,11 +178,10 @@ class MockPokerGame(PokerGame):
             return super().ai_decision(player, community_cards, current_bet, to_call)
         
         # Use scripted action
-        round_actions = self.script.actions_by_round.get(self.current_round.lower(), [])
-        
-        for action_obj in round_actions:
-            if action_obj.player_id == player.player_id:
-                return action_obj.action
+        stage_id = _STAGE_ID.get(self._current_round_lc)
+        action = self.script._action_map.get((stage_id, player.player_id))
+        if action is not None:
+            return action
         
         # Fallback to normal AI decision
         return super().ai_decision(player, community_cards, current_bet, to_call)
@@ -113,6 +189,7 @@ class MockPokerGame(PokerGame):
     def betting_round(self, stage):
         """Override to set current round and use script cards"""
         self.current_round = stage
+        self._current_round_lc = stage.lower() if stage else None
         self.override_community_cards(stage)
         super().betting_round(stage)
 
@@ -120,36 +197,51 @@ class MockPokerGame(PokerGame):
 class GameTester:
     """Test utilities for poker game logic"""
     
+    # Counters live in one list ([passed, failed]): item stores are cheaper
+    # than attribute stores on the assertion hot path
+    __slots__ = ('_counts', 'test_results')
+    
     def __init__(self):
-        self.assertions_passed = 0
-        self.assertions_failed = 0
+        self._counts = [0, 0]
         self.test_results = []
     
+    @property
+    def assertions_passed(self) -> int:
+        return self._counts[0]
+    
+    @assertions_passed.setter
+    def assertions_passed(self, value: int):
+        self._counts[0] = value
+    
+    @property
+    def assertions_failed(self) -> int:
+        return self._counts[1]
+    
+    @assertions_failed.setter
+    def assertions_failed(self, value: int):
+        self._counts[1] = value
+    
     def parse_card_string(self, card_str: str) -> Card:
         """Parse 'AS', '2H', etc. into Card"""
-        if len(card_str) < 2:
-            raise ValueError(f"Invalid card string: {card_str}")
-        
-        rank = card_str[:-1]
-        suit_char = card_str[-1].upper()
-        
-        suit_map = {'H': 'Hearts', 'D': 'Diamonds', 'C': 'Clubs', 'S': 'Spades'}
-        if suit_char not in suit_map:
-            raise ValueError(f"Invalid suit: {suit_char}")
-        
-        return Card(suit_map[suit_char], rank)
+        return _parse_card(card_str)
     
     def parse_hand(self, hand_str: str) -> List[Card]:
         """Parse space-separated cards like 'AS 2H' into list of Cards"""
-        return [self.parse_card_string(card) for card in hand_str.split()]
+        return [_parse_card(card) for card in hand_str.split()]
+    
+    def parse_hand_ck(self, hand_str: str) -> Tuple[int, ...]:
+        """Parse space-separated cards like 'AS 2H' into Cactus-Kev ints"""
+        ck = _CK_CACHE.get
+        return tuple(ck(card) or _parse_card(card).ck_int for card in hand_str.split())
     
     def assert_equal(self, actual: Any, expected: Any, message: str = ""):
         """Assert that actual equals expected"""
+        counts = self._counts
         if actual == expected:
-            self.assertions_passed += 1
+            counts[0] += 1
             return True
         else:
-            self.assertions_failed += 1
+            counts[1] += 1
             msg = f"FAIL: {message}\n  Expected: {expected}\n  Actual: {actual}"
             self.test_results.append(msg)
             print(msg)
@@ -157,11 +249,12 @@ class GameTester:
     
     def assert_true(self, condition: bool, message: str = ""):
         """Assert that condition is true"""
+        counts = self._counts
         if condition:
-            self.assertions_passed += 1
+            counts[0] += 1
             return True
         else:
-            self.assertions_failed += 1
+            counts[1] += 1
             msg = f"FAIL: {message} (expected True)"
             self.test_results.append(msg)
             print(msg)
@@ -169,11 +262,12 @@ class GameTester:
     
     def assert_false(self, condition: bool, message: str = ""):
         """Assert that condition is false"""
+        counts = self._counts
         if not condition:
-            self.assertions_passed += 1
+            counts[0] += 1
             return True
         else:
-            self.assertions_failed += 1
+            counts[1] += 1
             msg = f"FAIL: {message} (expected False)"
             self.test_results.append(msg)
             print(msg)
@@ -186,18 +280,34 @@ class GameTester:
     
     def assert_hand_type(self, cards: List[Card], expected_type: str, message: str = ""):
         """Assert that cards evaluate to specific hand type"""
-        hand_info = HandEvaluator.evaluate_hand(cards)
-        actual_type = hand_info[0]
+        if len(cards) == 5:
+            actual_type = CATEGORY_OF_RANK[evaluate5(*(card.ck_int for card in cards))]
+        else:
+            actual_type = HAND_NAMES[evaluate_mask(cards_to_mask(cards))[0]]
+        return self.assert_equal(actual_type, expected_type, 
+                                f"Hand type {message}")
+    
+    def assert_hand_type_ck(self, ck_hand: Tuple[int, ...], expected_type: str, message: str = ""):
+        """Assert that five Cactus-Kev ints evaluate to specific hand type"""
+        actual_type = CATEGORY_OF_RANK[evaluate5(*ck_hand)]
         return self.assert_equal(actual_type, expected_type, 
                                 f"Hand type {message}")
     
+    def assert_eligible_mask(self, pot: Dict, expected_mask: int, message: str = ""):
+        """Assert a pot's eligible players as a bitmask (bit i = player i eligible)"""
+        mask = pot.get('eligible_mask')
+        if mask is None:
+            mask = sum(1 << player_id for player_id in pot['eligible_players'])
+        return self.assert_equal(mask, expected_mask, message)
+    
     def assert_not_equal(self, actual: Any, expected: Any, message: str = ""):
         """Assert that actual does NOT equal expected"""
+        counts = self._counts
         if actual != expected:
-            self.assertions_passed += 1
+            counts[0] += 1
             return True
         else:
-            self.assertions_failed += 1
+            counts[1] += 1
             msg = f"FAIL: {message}\n  Values should not be equal: {actual}"
             self.test_results.append(msg)
             print(msg)
@@ -205,59 +315,97 @@ class GameTester:
     
     def print_summary(self):
         """Print test summary"""
-        total = self.assertions_passed + self.assertions_failed
+        passed, failed = self._counts
+        total = passed + failed
         print(f"\n{'='*60}")
-        print(f"TEST SUMMARY: {self.assertions_passed}/{total} passed")
-        if self.assertions_failed > 0:
-            print(f"FAILURES: {self.assertions_failed}")
+        print(f"TEST SUMMARY: {passed}/{total} passed")
+        if failed > 0:
+            print(f"FAILURES: {failed}")
         print(f"{'='*60}\n")
 
 
+def _side_pots_only(bets: List[int], folded_mask: int = 0) -> List[Dict]:
+    """Run PokerGame.create_side_pots for players with the given bets.
+    
+    Bit i of folded_mask marks player i as folded. Only the players are
+    built - the rest of PokerGame setup (deck, blinds, bots) is skipped.
+    """
+    game = PokerGame.__new__(PokerGame)
+    game.players = [Player(player_id, 0) for player_id in range(len(bets))]
+    for player, bet in zip(game.players, bets):
+        player.total_bet_this_round = bet
+        player.is_folded = bool(folded_mask >> player.player_id & 1)
+    return game.create_side_pots()
+
+
+@lru_cache(maxsize=16)
+def _template_game(num_players: int, starting_stack: int, use_bots: bool) -> PokerGame:
+    """Build (once per configuration) a game that tests copy instead of constructing"""
+    return PokerGame(num_players=num_players, starting_stack=starting_stack, use_bots=use_bots)
+
+
+def _fresh_game(num_players: int = 3, starting_stack: int = 1000, use_bots: bool = False) -> PokerGame:
+    """Return a game in its initial state, copied from a cached template"""
+    template = _template_game(num_players, starting_stack, use_bots)
+    game = copy.copy(template)
+    for name in ("stacks", "round_bets", "folded", "all_in"):
+        setattr(game, name, copy.copy(getattr(template, name)))
+    game.players = [copy.copy(player) for player in template.players]
+    for player in game.players:
+        player._game = game
+        player.hole_cards = []
+    game.rng = random.Random()  # Own shuffle stream, as a newly built game has
+    game.deck = None
+    game.community_cards = []
+    game.side_pots = []
+    game.total_bet_by_player = {}
+    game.bots = {}
+    if template.use_bots:
+        game._initialize_bots(num_players)  # Bots carry their own random streams and equity caches
+    return game
+
+
+# (hand, expected hand type, assertion message) for test_hand_evaluation
+_HAND_EVAL_CASES: Tuple[Tuple[str, str, str], ...] = (
+    ("AS KS QS JS 10S", "Royal Flush", "royal flush detection"),
+    ("9H 8H 7H 6H 5H", "Straight Flush", "straight flush detection"),
+    ("2D 2C 2H 2S KH", "Four of a Kind", "four of a kind detection"),
+    ("3D 3C 3H 5S 5H", "Full House", "full house detection"),
+    ("2C 4C 6C 8C 10C", "Flush", "flush detection"),
+    ("9D 8C 7H 6S 5D", "Straight", "straight detection"),
+    ("7D 7C 7H QS KH", "Three of a Kind", "three of a kind detection"),
+    ("JD JC 5H 5S KH", "Two Pair", "two pair detection"),
+    ("AD AC KH QS JD", "One Pair", "one pair detection"),
+    ("AS KD QC JS 9H", "High Card", "high card detection"),
+)
+
+# Each case's hand, preparsed to Cactus-Kev ints (same order as the cases)
+_HAND_EVAL_CK: Tuple[Tuple[int, ...], ...] = tuple(
+    tuple(_CK_CACHE[card] for card in hand_str.split())
+    for hand_str, _, _ in _HAND_EVAL_CASES
+)
+
+
 # Example test cases
 def test_hand_evaluation():
     """Test that hand evaluation works correctly"""
     print("Testing Hand Evaluation...")
     tester = GameTester()
     
-    # Test royal flush
-    royal_flush = tester.parse_hand("AS KS QS JS 10S 9S 8S")[:5]
-    tester.assert_hand_type(royal_flush, "Royal Flush", "royal flush detection")
-    
-    # Test straight flush
-    straight_flush = tester.parse_hand("9H 8H 7H 6H 5H")
-    tester.assert_hand_type(straight_flush, "Straight Flush", "straight flush detection")
-    
-    # Test four of a kind
-    four_kind = tester.parse_hand("2D 2C 2H 2S KH")
-    tester.assert_hand_type(four_kind, "Four of a Kind", "four of a kind detection")
-    
-    # Test full house
-    full_house = tester.parse_hand("3D 3C 3H 5S 5H")
-    tester.assert_hand_type(full_house, "Full House", "full house detection")
+    # Rank every case in one call, then check the categories
+    hand_ranks = evaluate5_batch(_HAND_EVAL_CK)
+    for hand_rank, (_, expected_type, message) in zip(hand_ranks, _HAND_EVAL_CASES):
+        tester.assert_equal(CATEGORY_OF_RANK[hand_rank], expected_type, f"Hand type {message}")
     
-    # Test flush
-    flush = tester.parse_hand("2C 4C 6C 8C 10C")
-    tester.assert_hand_type(flush, "Flush", "flush detection")
+    # 7-card ranking picks the best five (flush over the board's straight)
+    seven = tuple(_CK_CACHE[card] for card in "2H 9H 5H 6C 7H 8D KH".split())
+    tester.assert_equal(CATEGORY_OF_RANK[evaluate_texas_cards(seven)], "Flush", "Hand type best of 7 cards")
     
-    # Test straight
-    straight = tester.parse_hand("9D 8C 7H 6S 5D")
-    tester.assert_hand_type(straight, "Straight", "straight detection")
-    
-    # Test three of a kind
-    three_kind = tester.parse_hand("7D 7C 7H QS KH")
-    tester.assert_hand_type(three_kind, "Three of a Kind", "three of a kind detection")
-    
-    # Test two pair
-    two_pair = tester.parse_hand("JD JC 5H 5S KH")
-    tester.assert_hand_type(two_pair, "Two Pair", "two pair detection")
-    
-    # Test one pair
-    one_pair = tester.parse_hand("AD AC KH QS JD")
-    tester.assert_hand_type(one_pair, "One Pair", "one pair detection")
-    
-    # Test high card
-    high_card = tester.parse_hand("AS KD QC JS 9H")
-    tester.assert_hand_type(high_card, "High Card", "high card detection")
+    # Monte Carlo equity: a made royal flush cannot lose, aces win ~85% heads-up
+    royal = HandEvaluator.monte_carlo_equity(tester.parse_hand("AH KH"), tester.parse_hand("QH JH 10H 2C 3D"), 2, n=200)
+    tester.assert_equal(royal, 1.0, "Equity of a made royal flush")
+    aces = HandEvaluator.monte_carlo_equity(tester.parse_hand("AS AH"), [], 1, n=2000)
+    tester.assert_true(0.80 <= aces <= 0.90, f"Equity of AA heads-up ({aces:.3f})")
     
     tester.print_summary()
     return tester
@@ -268,36 +416,24 @@ def test_side_pots():
     print("\nTesting Side Pots...")
     tester = GameTester()
     
-    script = GameScript(num_players=3, starting_stack=100)
-    game = MockPokerGame(script)
-    game.DEBUG = False
-    
-    # Simulate 3 players with different all-in amounts
-    game.players[0].is_folded = False
-    game.players[0].total_bet_this_round = 30  # Smallest
-    
-    game.players[1].is_folded = False
-    game.players[1].total_bet_this_round = 70  # Medium
-    
-    game.players[2].is_folded = False
-    game.players[2].total_bet_this_round = 100  # All-in for most
-    
-    pots = game.create_side_pots()
+    # Simulate 3 players with different all-in amounts:
+    # $30 (smallest), $70 (medium), $100 (all-in for most)
+    pots = _side_pots_only([30, 70, 100])
     
     # Should create 3 pots
     tester.assert_equal(len(pots), 3, "Number of side pots")
     
     # Main pot: $90 (30 from each of 3 players)
     tester.assert_equal(pots[0]['amount'], 90, "Main pot amount")
-    tester.assert_equal(set(pots[0]['eligible_players']), {0, 1, 2}, "Main pot eligible players")
+    tester.assert_eligible_mask(pots[0], 0b111, "Main pot eligible players")
     
     # Side pot 1: $80 (40 from players 1,2)
     tester.assert_equal(pots[1]['amount'], 80, "Side pot 1 amount")
-    tester.assert_equal(set(pots[1]['eligible_players']), {1, 2}, "Side pot 1 eligible players")
+    tester.assert_eligible_mask(pots[1], 0b110, "Side pot 1 eligible players")
     
     # Side pot 2: $30 (30 from player 2)
     tester.assert_equal(pots[2]['amount'], 30, "Side pot 2 amount")
-    tester.assert_equal(set(pots[2]['eligible_players']), {2}, "Side pot 2 eligible players")
+    tester.assert_eligible_mask(pots[2], 0b100, "Side pot 2 eligible players")
     
     tester.print_summary()
     return tester
@@ -352,24 +488,8 @@ def test_all_in_scenario():
     print("\nTesting All-In Scenario...")
     tester = GameTester()
     
-    script = GameScript(num_players=2, starting_stack=100)
-    game = MockPokerGame(script)
-    game.DEBUG = False
-    
     # Simulate all-in: Player 0 goes all-in for $50, Player 1 calls with $100
-    game.players[0].stack = 50
-    game.players[0].total_bet_this_round = 50
-    game.players[0].is_all_in = True
-    game.players[0].is_folded = False
-    game.pot = 100
-    
-    game.players[1].stack = 50
-    game.players[1].total_bet_this_round = 100
-    game.players[1].is_all_in = False
-    game.players[1].is_folded = False
-    
-    # Create side pots
-    pots = game.create_side_pots()
+    pots = _side_pots_only([50, 100])
     
     # Should have 2 pots: main pot ($100) and side pot ($50)
     tester.assert_equal(len(pots), 2, "Number of pots with all-in")
@@ -385,48 +505,31 @@ def test_complex_side_pots():
     print("\nTesting Complex Side Pots...")
     tester = GameTester()
     
-    script = GameScript(num_players=4, starting_stack=1000)
-    game = MockPokerGame(script)
-    game.DEBUG = False
-    
     # Scenario: 4 players with different all-in amounts
     # Player 0: all-in for $50
     # Player 1: all-in for $150
     # Player 2: all-in for $200
     # Player 3: calls for $250 (more than player 2)
-    
-    game.players[0].is_folded = False
-    game.players[0].total_bet_this_round = 50
-    
-    game.players[1].is_folded = False
-    game.players[1].total_bet_this_round = 150
-    
-    game.players[2].is_folded = False
-    game.players[2].total_bet_this_round = 200
-    
-    game.players[3].is_folded = False
-    game.players[3].total_bet_this_round = 250
-    
-    pots = game.create_side_pots()
+    pots = _side_pots_only([50, 150, 200, 250])
     
     # Should have 4 pots (one for each level)
     tester.assert_equal(len(pots), 4, "Number of pots with 4 all-in levels")
     
     # Main pot: $200 (50 from each of 4 players)
     tester.assert_equal(pots[0]['amount'], 200, "Main pot (level 1)")
-    tester.assert_equal(set(pots[0]['eligible_players']), {0, 1, 2, 3}, "Main pot eligible")
+    tester.assert_eligible_mask(pots[0], 0b1111, "Main pot eligible")
     
     # Side pot 1: $300 (100 from players 1,2,3 at level 2: 150-50=100 each)
     tester.assert_equal(pots[1]['amount'], 300, "Side pot 1 (level 2)")
-    tester.assert_equal(set(pots[1]['eligible_players']), {1, 2, 3}, "Side pot 1 eligible")
+    tester.assert_eligible_mask(pots[1], 0b1110, "Side pot 1 eligible")
     
     # Side pot 2: $100 (50 from players 2,3 at level 3: 200-150=50 each)
     tester.assert_equal(pots[2]['amount'], 100, "Side pot 2 (level 3)")
-    tester.assert_equal(set(pots[2]['eligible_players']), {2, 3}, "Side pot 2 eligible")
+    tester.assert_eligible_mask(pots[2], 0b1100, "Side pot 2 eligible")
     
     # Side pot 3: $50 (50 from player 3 only at level 4: 250-200=50)
     tester.assert_equal(pots[3]['amount'], 50, "Side pot 3 (level 4)")
-    tester.assert_equal(set(pots[3]['eligible_players']), {3}, "Side pot 3 eligible")
+    tester.assert_eligible_mask(pots[3], 0b1000, "Side pot 3 eligible")
     
     tester.print_summary()
     return tester
@@ -437,35 +540,21 @@ def test_all_in_with_folded_players():
     print("\nTesting All-In With Folded Players...")
     tester = GameTester()
     
-    script = GameScript(num_players=3, starting_stack=200)
-    game = MockPokerGame(script)
-    game.DEBUG = False
-    
-    # Player 0: folded
+    # Player 0: folded after betting $50 - shouldn't be in any pot
     # Player 1: all-in for $100
     # Player 2: calls for $150
-    
-    game.players[0].is_folded = True  # Folded - shouldn't be in any pot
-    game.players[0].total_bet_this_round = 50
-    
-    game.players[1].is_folded = False
-    game.players[1].total_bet_this_round = 100
-    
-    game.players[2].is_folded = False
-    game.players[2].total_bet_this_round = 150
-    
-    pots = game.create_side_pots()
+    pots = _side_pots_only([50, 100, 150], folded_mask=0b001)
     
     # Should have 2 pots (folded player excluded)
     tester.assert_equal(len(pots), 2, "Number of pots with folded player")
     
     # Main pot: $200 (100 from players 1,2)
     tester.assert_equal(pots[0]['amount'], 200, "Main pot excludes folded player")
-    tester.assert_equal(set(pots[0]['eligible_players']), {1, 2}, "Main pot doesn't include folded player")
+    tester.assert_eligible_mask(pots[0], 0b110, "Main pot doesn't include folded player")
     
     # Side pot: $50 (50 from player 2 only)
     tester.assert_equal(pots[1]['amount'], 50, "Side pot from player 2")
-    tester.assert_equal(set(pots[1]['eligible_players']), {2}, "Side pot only from player 2")
+    tester.assert_eligible_mask(pots[1], 0b100, "Side pot only from player 2")
     
     tester.print_summary()
     return tester
@@ -476,32 +565,21 @@ def test_all_in_heads_up():
     print("\nTesting All-In Heads-Up...")
     tester = GameTester()
     
-    script = GameScript(num_players=2, starting_stack=100)
-    game = MockPokerGame(script)
-    game.DEBUG = False
-    
     # Simple heads-up all-in
     # Player 0: all-in for $75
     # Player 1: calls for $100
-    
-    game.players[0].is_folded = False
-    game.players[0].total_bet_this_round = 75
-    
-    game.players[1].is_folded = False
-    game.players[1].total_bet_this_round = 100
-    
-    pots = game.create_side_pots()
+    pots = _side_pots_only([75, 100])
     
     # Should have 2 pots
     tester.assert_equal(len(pots), 2, "Heads-up creates 2 pots")
     
     # Main pot: $150 (75 from each)
     tester.assert_equal(pots[0]['amount'], 150, "Main pot in heads-up")
-    tester.assert_equal(set(pots[0]['eligible_players']), {0, 1}, "Both players in main pot")
+    tester.assert_eligible_mask(pots[0], 0b11, "Both players in main pot")
     
     # Side pot: $25 (25 from player 1)
     tester.assert_equal(pots[1]['amount'], 25, "Side pot in heads-up")
-    tester.assert_equal(set(pots[1]['eligible_players']), {1}, "Only player 1 in side pot")
+    tester.assert_eligible_mask(pots[1], 0b10, "Only player 1 in side pot")
     
     tester.print_summary()
     return tester
@@ -512,28 +590,15 @@ def test_all_in_equal_stacks():
     print("\nTesting All-In Equal Stacks...")
     tester = GameTester()
     
-    script = GameScript(num_players=3, starting_stack=100)
-    game = MockPokerGame(script)
-    game.DEBUG = False
-    
     # All three players all-in for same amount
-    game.players[0].is_folded = False
-    game.players[0].total_bet_this_round = 100
-    
-    game.players[1].is_folded = False
-    game.players[1].total_bet_this_round = 100
-    
-    game.players[2].is_folded = False
-    game.players[2].total_bet_this_round = 100
-    
-    pots = game.create_side_pots()
+    pots = _side_pots_only([100, 100, 100])
     
     # Should have only 1 pot (no side pots needed)
     tester.assert_equal(len(pots), 1, "Equal all-in creates single pot")
     
     # Main pot: $300 (100 from each of 3 players)
     tester.assert_equal(pots[0]['amount'], 300, "Single pot amount")
-    tester.assert_equal(set(pots[0]['eligible_players']), {0, 1, 2}, "All players in single pot")
+    tester.assert_eligible_mask(pots[0], 0b111, "All players in single pot")
     
     tester.print_summary()
     return tester
@@ -544,7 +609,7 @@ def test_hand_tiebreaker():
     print("\nTesting Hand Tiebreaker Logic...")
     tester = GameTester()
     
-    game = PokerGame(num_players=2, starting_stack=1000, use_bots=False)
+    game = _fresh_game(num_players=2, starting_stack=1000)
     game.DEBUG = False
     
     # Both players have a pair, but different kickers
@@ -553,12 +618,18 @@ def test_hand_tiebreaker():
     # Player 1: Pair of 8s with A, K, J kickers (worse Q kicker)
     player1_hand = tester.parse_hand("8H 8S AD KD JC 9D 7C")
     
-    eval0 = HandEvaluator.evaluate_hand(player0_hand)
-    eval1 = HandEvaluator.evaluate_hand(player1_hand)
+    eval0 = evaluate_mask(cards_to_mask(player0_hand))
+    eval1 = evaluate_mask(cards_to_mask(player1_hand))
     
     # eval0 should be better due to Q vs J kicker
     tester.assert_true(eval0[1] > eval1[1], "Higher kicker should win tiebreaker")
     
+    # find_best_hand returns the same tiebreaker for its best five cards
+    best0 = HandEvaluator.find_best_hand(player0_hand[:2], player0_hand[2:])
+    best1 = HandEvaluator.find_best_hand(player1_hand[:2], player1_hand[2:])
+    tester.assert_equal(best0[2], HandEvaluator.evaluate_hand(best0[1])[1], "find_best_hand tiebreaker matches evaluate_hand")
+    tester.assert_true(best0[2] > best1[2], "Higher kicker should win find_best_hand tiebreaker")
+    
     tester.print_summary()
     return tester
 
@@ -568,7 +639,7 @@ def test_fold_logic():
     print("\nTesting Fold Logic...")
     tester = GameTester()
     
-    game = PokerGame(num_players=3, starting_stack=1000, use_bots=False)
+    game = _fresh_game(num_players=3, starting_stack=1000)
     game.DEBUG = False
     
     # Set up scenario where one player folds
@@ -591,8 +662,8 @@ def test_fold_logic():
     
     # Check that folded player (1) is not in eligible players
     for pot in pots:
-        tester.assert_true(1 not in pot['eligible_players'], 
-                          f"Folded player should not be eligible for pot")
+        tester.assert_false(pot['eligible_mask'] & (1 << 1), 
+                           f"Folded player should not be eligible for pot")
     
     tester.print_summary()
     return tester
@@ -604,7 +675,7 @@ def test_minimum_raise():
     tester = GameTester()
     
     # Test raise amount validation
-    game = PokerGame(num_players=2, starting_stack=1000, use_bots=False)
+    game = _fresh_game(num_players=2, starting_stack=1000)
     game.DEBUG = False
     game.big_blind = 10
     
@@ -631,11 +702,11 @@ def test_pot_calculation():
     print("\nTesting Pot Calculation Accuracy...")
     tester = GameTester()
     
-    game = PokerGame(num_players=4, starting_stack=500, use_bots=False)
+    game = _fresh_game(num_players=4, starting_stack=500)
     game.DEBUG = False
     
-    # Set player contributions
-    contributions = [100, 75, 150, 50]
+    # Set player contributions (a typed int32 buffer, one slot per player)
+    contributions = array('i', [100, 75, 150, 50])
     for i, contribution in enumerate(contributions):
         game.players[i].total_bet_this_round = contribution
     
@@ -646,10 +717,10 @@ def test_pot_calculation():
     tester.assert_equal(expected_pot, 375, "Pot calculation correct")
     
     # Test with different amounts
-    game2 = PokerGame(num_players=3, starting_stack=1000, use_bots=False)
+    game2 = _fresh_game(num_players=3, starting_stack=1000)
     game2.DEBUG = False
     
-    contributions2 = [250, 250, 250]
+    contributions2 = array('i', [250, 250, 250])
     total2 = sum(contributions2)
     tester.assert_equal(total2, 750, "Equal contribution pot")
     
@@ -662,7 +733,7 @@ def test_button_advancement():
     print("\nTesting Button Advancement...")
     tester = GameTester()
     
-    game = PokerGame(num_players=3, starting_stack=1000, use_bots=False)
+    game = _fresh_game(num_players=3, starting_stack=1000)
     game.DEBUG = False
     
     # Test button advancement through multiple rounds
@@ -679,7 +750,7 @@ def test_button_advancement():
     tester.assert_equal(next_button, 0, "Button wraps from 2 to 0")
     
     # Test with 2 players (heads-up)
-    game2 = PokerGame(num_players=2, starting_stack=1000, use_bots=False)
+    game2 = _fresh_game(num_players=2, starting_stack=1000)
     game2.DEBUG = False
     game2.button = 0
     next_button = (game2.button + 1) % len(game2.players)
@@ -698,7 +769,7 @@ def test_check_validation():
     print("\nTesting Check Validation...")
     tester = GameTester()
     
-    game = PokerGame(num_players=2, starting_stack=1000, use_bots=False)
+    game = _fresh_game(num_players=2, starting_stack=1000)
     game.DEBUG = False
     game.current_bet = 0
     
@@ -720,7 +791,7 @@ def test_bet_reset_between_streets():
     print("\nTesting Bet Reset Between Streets...")
     tester = GameTester()
     
-    game = PokerGame(num_players=2, starting_stack=1000, use_bots=False)
+    game = _fresh_game(num_players=2, starting_stack=1000)
     game.DEBUG = False
     
     # Simulate pre-flop betting
@@ -751,17 +822,16 @@ def test_player_elimination():
     print("\nTesting Player Elimination...")
     tester = GameTester()
     
-    game = PokerGame(num_players=3, starting_stack=100, use_bots=False)
+    game = _fresh_game(num_players=3, starting_stack=100)
     game.DEBUG = False
     
     # Simulate player 1 losing all chips
     game.players[1].stack = 0
     
     # Player with 0 stack should be eliminated (no longer active)
-    remaining_players = [p for p in game.players if p.stack > 0]
-    tester.assert_equal(len(remaining_players), 2, "Should have 2 players with chips")
-    tester.assert_not_equal(remaining_players[0].player_id, 1, "Player 1 eliminated")
-    tester.assert_not_equal(remaining_players[1].player_id, 1, "Player 1 eliminated")
+    tester.assert_equal(game.alive_count(), 2, "Should have 2 players with chips")
+    tester.assert_false(game.alive_mask & (1 << 1), "Player 1 eliminated")
+    tester.assert_equal(game.alive_mask, 0b101, "Players 0 and 2 still have chips")
     
     tester.print_summary()
     return tester
@@ -772,7 +842,7 @@ def test_current_bet_tracking():
     print("\nTesting Current Bet Tracking...")
     tester = GameTester()
     
-    game = PokerGame(num_players=3, starting_stack=1000, use_bots=False)
+    game = _fresh_game(num_players=3, starting_stack=1000)
     game.DEBUG = False
     
     # Start with big blind
@@ -803,7 +873,7 @@ def test_betting_order():
     tester = GameTester()
     
     # Test with 3 players
-    game = PokerGame(num_players=3, starting_stack=1000, use_bots=False)
+    game = _fresh_game(num_players=3, starting_stack=1000)
     game.DEBUG = False
     
     # Set button position
@@ -845,7 +915,7 @@ def test_action_sequence():
     tester = GameTester()
     
     # Create game with 2 players to simplify
-    game = PokerGame(num_players=2, starting_stack=1000, use_bots=False)
+    game = _fresh_game(num_players=2, starting_stack=1000)
     game.DEBUG = False
     
     # Player 0 is button/dealer
@@ -862,7 +932,7 @@ def test_action_sequence():
     
     # Verify the two different order calculations produce DIFFERENT results
     # (for 3+ players)
-    game3 = PokerGame(num_players=3, starting_stack=1000, use_bots=False)
+    game3 = _fresh_game(num_players=3, starting_stack=1000)
     game3.button = 0
     preflop_start_3 = (game3.button + 3) % len(game3.players)
     postflop_start_3 = (game3.button + 1) % len(game3.players)
@@ -893,7 +963,7 @@ def test_stage_parameter_propagation():
     
     # Verify that passing wrong stage name would break logic
     # (This is a meta-test showing the bug we fixed)
-    game = PokerGame(num_players=3, starting_stack=1000, use_bots=False)
+    game = _fresh_game(num_players=3, starting_stack=1000)
     game.button = 0
     
     # If we mistakenly passed "Pre-Flop" for flop stage:
@@ -908,32 +978,61 @@ def test_stage_parameter_propagation():
     return tester
 
 
+def test_seeded_games_repeat():
+    """Test that games built with the same seed deal and play identically"""
+    print("\nTesting Seeded Games...")
+    tester = GameTester()
+    
+    results = []
+    for _ in range(2):
+        game = PokerGame(num_players=4, starting_stack=1000, use_bots=True, seed=7)
+        hole_cards = []
+        for _ in range(6):
+            game.play_hand()
+            hole_cards.append([list(player.hole_cards) for player in game.players])
+        results.append((repr(hole_cards), list(game.stacks)))
+    
+    tester.assert_equal(results[0][0], results[1][0], "Same seed deals the same cards")
+    tester.assert_equal(results[0][1], results[1][1], "Same seed ends with the same stacks")
+    
+    tester.print_summary()
+    return tester
+
+
+# Every test in run order; all_tests.py runs these (sharded across workers)
+TESTS: Tuple[Callable[[], GameTester], ...] = (
+    test_hand_evaluation,
+    test_side_pots,
+    test_complex_side_pots,
+    test_all_in_scenario,
+    test_all_in_with_folded_players,
+    test_all_in_heads_up,
+    test_all_in_equal_stacks,
+    test_simple_hand,
+    test_hand_tiebreaker,
+    test_fold_logic,
+    test_minimum_raise,
+    test_pot_calculation,
+    test_button_advancement,
+    test_check_validation,
+    test_bet_reset_between_streets,
+    test_player_elimination,
+    test_current_bet_tracking,
+    test_betting_order,
+    test_action_sequence,
+    test_stage_parameter_propagation,
+    test_seeded_games_repeat,
+)
+
+
 if __name__ == "__main__":
     print("="*60)
     print("POKER GAME TEST SUITE")
     print("="*60)
     
     # Run all tests
-    test_hand_evaluation()
-    test_side_pots()
-    test_complex_side_pots()
-    test_all_in_scenario()
-    test_all_in_with_folded_players()
-    test_all_in_heads_up()
-    test_all_in_equal_stacks()
-    test_simple_hand()
-    test_hand_tiebreaker()
-    test_fold_logic()
-    test_minimum_raise()
-    test_pot_calculation()
-    test_button_advancement()
-    test_check_validation()
-    test_bet_reset_between_streets()
-    test_player_elimination()
-    test_current_bet_tracking()
-    test_betting_order()
-    test_action_sequence()
-    test_stage_parameter_propagation()
+    for test in TESTS:
+        test()
     
     print("\n" + "="*60)
     print("All tests completed!")
@@ -0,0 +1,224 @@
+"""
+Cactus-Kev hand ranking: lookup tables and the 5-7 card evaluators
+
+Kept apart from poker_game so build_config.py can compile it with mypyc;
+it only works on plain ints (Card.ck_int values) and flat tables. The
+poker_game module re-exports everything here.
+"""
+
+import os
+import pickle
+from array import array
+from itertools import combinations, combinations_with_replacement
+from typing import Dict, Final, Sequence, Tuple
+
+from config import HAND_RANK_TYPECODE, HAND_TABLE_CACHE_PATH
+
+# One prime per rank (2..A) for Cactus-Kev card encoding
+CK_PRIMES = (2, 3, 5, 7, 11, 13, 17, 19, 23, 29, 31, 37, 41)
+
+# Hand categories, weakest to strongest
+(HIGH_CARD, ONE_PAIR, TWO_PAIR, THREE_OF_A_KIND, STRAIGHT, FLUSH,
+ FULL_HOUSE, FOUR_OF_A_KIND, STRAIGHT_FLUSH, ROYAL_FLUSH) = range(1, 11)
+
+# Display name of each hand category (index 0 is unused)
+HAND_NAMES = (
+    "", "High Card", "One Pair", "Two Pair", "Three of a Kind", "Straight",
+    "Flush", "Full House", "Four of a Kind", "Straight Flush", "Royal Flush",
+)
+
+# Hand type name -> category value
+HAND_RANKS = {name: category for category, name in enumerate(HAND_NAMES) if name}
+
+
+def _build_cactus_tables():
+    """Build the Cactus-Kev lookup tables.
+
+    Every distinct 5-card hand value (7462 equivalence classes) gets a rank
+    from 1 (royal flush) to 7462 (7-5-4-3-2 high card). Flushes and
+    five-unique-rank hands are indexed by their 13-bit rank pattern; hands
+    with a paired rank are keyed by the product of their rank primes.
+    """
+    # (category, kickers) where higher compares better; category numbers
+    # follow HAND_RANKS, except a royal flush is just the
+    # best straight flush here
+    classes = []
+    for ranks in combinations(range(12, -1, -1), 5):
+        bits = sum(1 << r for r in ranks)
+        if ranks[0] - ranks[4] == 4:
+            straight_high = ranks[0]
+        elif ranks == (12, 3, 2, 1, 0):
+            straight_high = 3  # Wheel: A-2-3-4-5 is a five-high straight
+        else:
+            straight_high = None
+        if straight_high is not None:
+            classes.append(((9, (straight_high,)), "flush", bits))
+            classes.append(((5, (straight_high,)), "unique", bits))
+        else:
+            classes.append(((6, ranks), "flush", bits))
+            classes.append(((1, ranks), "unique", bits))
+
+    category_by_counts = {(4, 1): 8, (3, 2): 7, (3, 1, 1): 4, (2, 2, 1): 3, (2, 1, 1, 1): 2}
+    for ranks in combinations_with_replacement(range(13), 5):
+        counts = {r: ranks.count(r) for r in set(ranks)}
+        category = category_by_counts.get(tuple(sorted(counts.values(), reverse=True)))
+        if category is None:
+            continue  # Five distinct ranks (handled above) or five of a kind
+        kickers = tuple(sorted(counts, key=lambda r: (counts[r], r), reverse=True))
+        product = 1
+        for r in ranks:
+            product *= CK_PRIMES[r]
+        classes.append(((category, kickers), "product", product))
+
+    classes.sort(key=lambda entry: entry[0], reverse=True)
+    flushes = array(HAND_RANK_TYPECODE, [0]) * 7937
+    unique5 = array(HAND_RANK_TYPECODE, [0]) * 7937
+    products = {}
+    category_of_rank = [""] * (len(classes) + 1)
+    names = {rank_value: name for name, rank_value in HAND_RANKS.items()}
+    for hand_rank, ((category, _), kind, key) in enumerate(classes, start=1):
+        if kind == "flush":
+            flushes[key] = hand_rank
+        elif kind == "unique":
+            unique5[key] = hand_rank
+        else:
+            products[key] = hand_rank
+        category_of_rank[hand_rank] = names[category]
+    category_of_rank[1] = "Royal Flush"
+    return flushes, unique5, products, tuple(category_of_rank)
+
+
+def evaluate5(c0: int, c1: int, c2: int, c3: int, c4: int) -> int:
+    """Rank five Cactus-Kev card ints (Card.ck_int): 1 is a royal flush, 7462 the worst hand"""
+    q = (c0 | c1 | c2 | c3 | c4) >> 16
+    if c0 & c1 & c2 & c3 & c4 & 0xF000:
+        return _CK_FLUSHES[q]
+    hand_rank = _CK_UNIQUE5[q]
+    if hand_rank:
+        return hand_rank
+    return _CK_PRODUCTS[(c0 & 0xFF) * (c1 & 0xFF) * (c2 & 0xFF) * (c3 & 0xFF) * (c4 & 0xFF)]
+
+
+def evaluate5_batch(hands):
+    """Rank many 5-card hands (each a sequence of five Card.ck_int) with evaluate5"""
+    return array(HAND_RANK_TYPECODE, [evaluate5(*hand) for hand in hands])
+
+
+def _build_texas_tables(ck_flushes, ck_unique5, ck_products):
+    """Build the 5-7 card lookup tables used by evaluate_texas_cards.
+
+    With at most 7 cards a flush rules out quads and full houses, so a hand
+    is either a flush (ranked by the rank bits of its flush suit) or ranked
+    by its rank multiset alone. Returns (flush_ranks, best_by_product):
+    flush_ranks maps a 5-7 bit rank pattern to its best flush rank;
+    best_by_product maps the prime product of 5, 6 or 7 ranks to the best
+    non-flush rank among them. Both are filled bottom-up from the 5-card
+    tables by dropping one card at a time.
+    """
+    flush_ranks = array(HAND_RANK_TYPECODE, [0]) * 8192
+    by_bit_count = {5: [], 6: [], 7: []}
+    for bits in range(8192):
+        count = bin(bits).count("1")
+        if count in by_bit_count:
+            by_bit_count[count].append(bits)
+    for bits in by_bit_count[5]:
+        flush_ranks[bits] = ck_flushes[bits]
+    for count in (6, 7):
+        for bits in by_bit_count[count]:
+            best = 7463
+            rest = bits
+            while rest:
+                low_bit = rest & -rest
+                rest ^= low_bit
+                best = min(best, flush_ranks[bits ^ low_bit])
+            flush_ranks[bits] = best
+
+    best_by_product = dict(ck_products)
+    for ranks in combinations(range(13), 5):
+        product = 1
+        for r in ranks:
+            product *= CK_PRIMES[r]
+        best_by_product[product] = ck_unique5[sum(1 << r for r in ranks)]
+    # Adding a card to every n-card multiset reaches every (n+1)-card one
+    smaller = list(best_by_product.items())
+    for _ in (6, 7):
+        larger = {}
+        for product, hand_rank in smaller:
+            for prime in CK_PRIMES:
+                if product % (prime ** 4) == 0:
+                    continue  # Would be a fifth card of one rank
+                key = product * prime
+                if hand_rank < larger.get(key, 7463):
+                    larger[key] = hand_rank
+        best_by_product.update(larger)
+        smaller = list(larger.items())
+    return flush_ranks, best_by_product
+
+
+def _load_tables():
+    """All lookup tables, read from the cache file if it was written by this hand_eval.py, else built and cached.
+
+    Returns (ck_flushes, ck_unique5, ck_products, category_of_rank,
+    flush_ranks, best_by_product); building them takes a few hundred
+    milliseconds, loading the cache a few tens.
+    """
+    cache_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), HAND_TABLE_CACHE_PATH)
+    source = (os.stat(__file__).st_mtime_ns, HAND_RANK_TYPECODE)
+    try:
+        with open(cache_path, "rb") as f:
+            cache = pickle.load(f)
+        if cache.get("source") == source:
+            return cache["tables"]
+    except FileNotFoundError:
+        pass
+    except Exception as e:
+        print(f"Ignoring hand table cache {cache_path}: {e}")
+
+    tables = _build_cactus_tables()
+    tables += _build_texas_tables(*tables[:3])
+    try:
+        with open(cache_path, "wb") as f:
+            pickle.dump({"source": source, "tables": tables}, f, protocol=pickle.HIGHEST_PROTOCOL)
+    except OSError as e:
+        print(f"Error writing hand table cache {cache_path}: {e}")
+    return tables
+
+
+# Final and typed so that, when compiled with mypyc, the evaluators read
+# these as native globals instead of looking them up in the module dict
+_TABLES = _load_tables()
+_CK_FLUSHES: Final = _TABLES[0]
+_CK_UNIQUE5: Final = _TABLES[1]
+_CK_PRODUCTS: Final[Dict[int, int]] = _TABLES[2]
+CATEGORY_OF_RANK: Final[Tuple[str, ...]] = _TABLES[3]
+_TEXAS_FLUSH_RANKS: Final = _TABLES[4]
+_TEXAS_BEST_BY_PRODUCT: Final[Dict[int, int]] = _TABLES[5]
+
+# HAND_RANKS value (1-10) of each Cactus-Kev rank
+HAND_RANK_OF_RANK = tuple(HAND_RANKS.get(category, 0) for category in CATEGORY_OF_RANK)
+
+
+# Per-suit card counter increment (one 4-bit lane per suit) by Cactus-Kev suit bits
+_SUIT_LANE: Final[Tuple[int, ...]] = (0, 0x1, 0x10, 0, 0x100, 0, 0, 0, 0x1000)
+
+
+def evaluate_texas_cards(cards: Sequence[int]) -> int:
+    """Rank the best 5-card hand in 5, 6 or 7 Cactus-Kev card ints (lower is better)
+
+    Two table lookups instead of scoring every 5-card subset (see _build_texas_tables).
+    """
+    product = 1
+    suit_counts = 0
+    for c in cards:
+        product *= c & 0xFF
+        suit_counts += _SUIT_LANE[(c >> 12) & 0xF]
+    # A lane reaching 5 sets its top bit once 3 is added
+    flush_lanes = (suit_counts + 0x3333) & 0x8888
+    if not flush_lanes:
+        return _TEXAS_BEST_BY_PRODUCT[product]
+    suit_bit = 0x1000 << (flush_lanes.bit_length() // 4 - 1)
+    rank_bits = 0
+    for c in cards:
+        if c & suit_bit:
+            rank_bits |= c >> 16
+    return _TEXAS_FLUSH_RANKS[rank_bits]
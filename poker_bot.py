@@ -3,9 +3,115 @@ Enhanced AI player for Texas Hold'em using game theory and win probability
 """
 
 import random
-from typing import List, Tuple, Optional
-from poker_game import Card, HandEvaluator
+from array import array
+from collections import OrderedDict
+from typing import Callable, ClassVar, Dict, List, Tuple, Optional
+from poker_game import Card, HAND_RANK_OF_RANK, evaluate_texas_cards
 from win_probability import WinProbabilityCalculator
+from config import NUM_SIMULATIONS_BOT, BOT_EQUITY_CACHE_SIZE
+
+
+def _preflop_formula(v1: int, v2: int, is_suited: bool) -> float:
+    """Pre-flop strength of hole cards with rank values v1, v2 (2-14)"""
+    is_pair = v1 == v2
+    
+    # Evaluate: AA-KK pairs = 1.0, AK suited = 0.90, down to 32o = 0.05
+    if is_pair:
+        high_value = max(v1, v2)
+        return 0.60 + (high_value - 2) / 12.0 * 0.40  # Pairs: 0.60-1.0
+    elif v1 == 14 or v2 == 14:
+        # Ace
+        low_value = min(v1, v2)
+        base = 0.75 if low_value >= 10 else 0.50 if low_value >= 6 else 0.35
+        return base + (0.15 if is_suited else 0.0)
+    elif v1 >= 12 or v2 >= 12:
+        # KQ, KJ, QJ
+        base = 0.55
+        return base + (0.10 if is_suited else 0.0)
+    elif is_suited:
+        high_value = max(v1, v2)
+        return 0.30 + (high_value - 2) / 12.0 * 0.20
+    else:
+        high_value = max(v1, v2)
+        return 0.15 + (high_value - 2) / 12.0 * 0.15
+
+
+# Hand-selection multiplier per position index (see poker_game.POSITIONS)
+_POS_MULT = (0.5, 0.8, 1.3)
+
+# Fixed-point scale for style parameters in 0.0-1.0 (Q0.7: 1.0 -> 127)
+Q7_SCALE = 127
+
+# Fixed-point scale for pre-flop strengths: every _preflop_formula value is a
+# multiple of 1/240, so an unsigned byte holds it exactly and strengths that
+# sit on a decision threshold (0.40, 0.65) stay on it
+PREFLOP_SCALE = 240
+
+
+def _build_preflop_table() -> array:
+    """
+    _preflop_formula for every hole-card class in units of 1/PREFLOP_SCALE
+    (unsigned bytes), indexed by (rank_idx1 * 13 + rank_idx2) * 2 + suited
+    """
+    return array('B', [
+        round(_preflop_formula(r1 + 2, r2 + 2, bool(suited)) * PREFLOP_SCALE)
+        for r1 in range(13) for r2 in range(13) for suited in (0, 1)
+    ])
+
+
+def _build_decide_fn(
+    fold_bias_q7: int,
+    aggression: float,
+    next_rand: Callable[[], float],
+    decide_check_or_bet: Callable[..., Tuple[str, Optional[int]]],
+    calculate_raise_amount: Callable[[int, int, float, float], int]
+) -> Callable[..., Tuple[str, Optional[int]]]:
+    """
+    Build PokerBot._make_decision for one bot type
+    
+    A bot's type never changes, so its fold bias and aggression are bound
+    into the closure once instead of being read through self.type on every
+    decision. The returned function takes _make_decision's arguments
+    positionally.
+    """
+    def decide(
+        to_call: int,
+        player_stack: int,
+        equity: float,
+        hand_strength: float,
+        pot_odds: float,
+        stack_depth: float,
+        position_multiplier: float,
+        num_opponents: int,
+        is_preflop: bool,
+        current_bet: int
+    ) -> Tuple[str, Optional[int]]:
+        # If checking is available, decide check vs bet
+        if to_call == 0:
+            return decide_check_or_bet(
+                equity, hand_strength, num_opponents, player_stack, current_bet
+            )
+        
+        # Fold decision: threshold adjusted by tightness and position (Q0.7)
+        if equity * Q7_SCALE < fold_bias_q7 * position_multiplier:
+            return ("fold", None)
+        
+        # Call threshold - compare equity to pot odds
+        # If equity > pot_odds, it's +EV to call
+        # (require slightly better odds due to variance)
+        if equity >= pot_odds * 0.8 or equity > 0.5:
+            # Consider raising
+            if next_rand() < aggression and hand_strength > 0.4:
+                raise_amount = calculate_raise_amount(
+                    to_call, player_stack, pot_odds, hand_strength
+                )
+                return ("raise", raise_amount)
+            return ("call", None)
+        
+        # Fold if equity is too low
+        return ("fold", None)
+    
+    return decide
 
 
 class PokerBotType:
@@ -21,6 +127,9 @@ class PokerBotType:
         self.name = name
         self.tightness = tightness  # Probability of folding weak hands
         self.aggression = aggression  # Probability of raising vs calling
+        
+        # Fold threshold before the position multiplier, in Q0.7
+        self.fold_bias_q7 = round((0.35 + tightness * 0.30) * Q7_SCALE)
 
 
 class PokerBot:
@@ -29,31 +138,83 @@ class PokerBot:
     """
     
     # Predefined player types
-    TYPES = {
+    TYPES: ClassVar[Dict[str, PokerBotType]] = {
         "TAG": PokerBotType("TAG (Tight Aggressive)", 0.75, 0.85),      # Pro style
         "LAG": PokerBotType("LAG (Loose Aggressive)", 0.35, 0.80),      # Aggressive
         "CTR": PokerBotType("CTR (Call-Fold)", 0.55, 0.40),             # Passive
         "NIT": PokerBotType("NIT (Nitty)", 0.90, 0.50),                 # Super tight
         "FISH": PokerBotType("FISH (Loose-Passive)", 0.30, 0.20),       # Weak player
     }
+    # TYPES values in a fixed tuple, for random type selection without a per-bot list
+    _TYPE_VALUES: ClassVar[Tuple[PokerBotType, ...]] = tuple(TYPES.values())
+    
+    # Monte Carlo calculator shared by all bots (see get_calc)
+    _shared_calc: ClassVar[Optional[WinProbabilityCalculator]] = None
+    
+    # Equity above which a bot bets when checking is free (with at most 2 opponents)
+    BET_EQUITY = 0.65
+    
+    # Typical heads-up equity by HandEvaluator.HAND_RANKS value (0 = no 5-card hand)
+    _MADE_HAND_EQUITY = (0.0, 0.33, 0.52, 0.77, 0.81, 0.92, 0.95, 0.97, 0.99, 1.0, 1.0)
+    
+    # Pre-flop strength per hole-card class in 1/PREFLOP_SCALE units (see _build_preflop_table)
+    _PREFLOP_TABLE: ClassVar[array] = _build_preflop_table()
     
-    def __init__(self, player_id: int, bot_type: Optional[str] = None):
+    def __init__(self, player_id: int, bot_type: Optional[str] = None, seed: Optional[int] = None):
         """
         Initialize a poker bot
         
         Args:
             player_id: The player's ID in the game
             bot_type: One of "TAG", "LAG", "CTR", "NIT", "FISH", or None for random
+            seed: Seed for this bot's raise/call draws and its own equity
+                simulations (None for an unseeded stream and the shared calculator)
         """
         self.player_id = player_id
         
+        # Private random stream; the bound method skips the module lookup per draw
+        self._rng = random.Random(seed)
+        self._next_rand = self._rng.random
+        
         if bot_type and bot_type in self.TYPES:
             self.type = self.TYPES[bot_type]
         else:
             # Random type
-            self.type = random.choice(list(self.TYPES.values()))
+            self.type = self._rng.choice(PokerBot._TYPE_VALUES)
+        
+        if seed is None:
+            self.win_prob_calc = PokerBot.get_calc()
+        else:
+            # A seeded bot replays exactly, so it can't draw run-outs from the shared stream
+            self.win_prob_calc = WinProbabilityCalculator(
+                num_simulations=NUM_SIMULATIONS_BOT, seed=self._rng.getrandbits(32)
+            )
         
-        self.win_prob_calc = WinProbabilityCalculator(num_simulations=1000)
+        # _make_decision with this bot's type folded in as constants
+        self._decide_fn = _build_decide_fn(
+            self.type.fold_bias_q7, self.type.aggression,
+            self._next_rand, self._decide_check_or_bet, self._calculate_raise_amount
+        )
+        
+        # (equity, run-outs simulated, thresholds) per (hole cards, board, opponents),
+        # least recently used first
+        self._equity_cache: "OrderedDict[tuple, Tuple[float, int, Optional[tuple]]]" = OrderedDict()
+    
+    @classmethod
+    def get_calc(cls) -> WinProbabilityCalculator:
+        """
+        The WinProbabilityCalculator shared by every bot, created on first use
+        
+        Sharing is safe because calculate_win_probability keeps no state
+        between calls.
+        """
+        if cls._shared_calc is None:
+            cls._shared_calc = WinProbabilityCalculator(num_simulations=NUM_SIMULATIONS_BOT)
+        return cls._shared_calc
+    
+    def reset_hand(self):
+        """Forget cached equities; called when a new hand is dealt"""
+        self._equity_cache.clear()
     
     def decide_action(
         self,
@@ -63,7 +224,7 @@ class PokerBot:
         to_call: int,
         player_stack: int,
         pot: int,
-        position: str,  # "early", "middle", "late"
+        position_idx: int,  # 0 = early, 1 = middle, 2 = late
         num_opponents: int,
         small_blind: int,
         big_blind: int
@@ -78,7 +239,8 @@ class PokerBot:
             to_call: Amount needed to call
             player_stack: Player's remaining stack
             pot: Current pot size
-            position: Position relative to button ("early", "middle", "late")
+            position_idx: Position relative to button, an index into poker_game.POSITIONS
+                (0 = early, 1 = middle, 2 = late)
             num_opponents: Number of active opponents
             small_blind: Small blind amount
             big_blind: Big blind amount
@@ -96,10 +258,6 @@ class PokerBot:
             )
             return decision
         
-        # Calculate hand strength
-        equity = self._get_equity(hole_cards, community_cards, num_opponents)
-        hand_strength = self._evaluate_hand_strength(hole_cards, community_cards)
-        
         # Pot odds
         pot_odds = to_call / (pot + to_call) if (pot + to_call) > 0 else 0
         
@@ -107,7 +265,12 @@ class PokerBot:
         stack_depth = player_stack / big_blind if big_blind > 0 else 0
         
         # Position multiplier (late position = looser, early = tighter)
-        position_multiplier = self._get_position_multiplier(position)
+        position_multiplier = _POS_MULT[position_idx]
+        
+        # Calculate hand strength
+        thresholds = self._equity_thresholds(to_call, pot_odds, position_multiplier)
+        equity = self._get_equity(hole_cards, community_cards, num_opponents, thresholds)
+        hand_strength = self._evaluate_hand_strength(hole_cards, community_cards)
         
         # Decide action based on equity and position
         return self._make_decision(
@@ -123,26 +286,65 @@ class PokerBot:
             current_bet=current_bet
         )
     
+    def _equity_thresholds(self, to_call: int, pot_odds: float, position_multiplier: float) -> List[float]:
+        """
+        Equity levels _make_decision compares against, so the simulation
+        can stop as soon as the answer is clear
+        """
+        if to_call == 0:
+            return [self.BET_EQUITY]
+        fold_threshold = self.type.fold_bias_q7 * position_multiplier / Q7_SCALE
+        return [fold_threshold, pot_odds * 0.8, 0.5]
+    
     def _get_equity(
         self,
         hole_cards: List[Card],
         community_cards: List[Card],
-        num_opponents: int
+        num_opponents: int,
+        thresholds: Optional[List[float]] = None
     ) -> float:
-        """Calculate win equity using Monte Carlo"""
-        try:
-            if num_opponents < 1:
-                return 0.5
-            
-            result = self.win_prob_calc.calculate_win_probability(
-                hole_cards,
-                community_cards,
-                num_opponents
-            )
-            return result['equity']
-        except Exception:
-            # Fallback if calculation fails
+        """
+        Calculate win equity using Monte Carlo (cached for the current hand)
+        
+        With thresholds, the simulation may stop early once the equity is
+        clearly above or below each of them (see
+        WinProbabilityCalculator.calculate_win_probability). A cached
+        early-exit estimate is only reused for the same thresholds, since it
+        says nothing about where the equity lies relative to others; a
+        full-length run is reused for any thresholds.
+        """
+        if num_opponents < 1:
+            return 0.5
+        if len(hole_cards) != 2 or len(community_cards) not in (0, 3, 4, 5):
+            # Not a position the simulator can deal out
             return self._simple_hand_strength(hole_cards, community_cards)
+        
+        key = (
+            frozenset(c.ck_int for c in hole_cards),
+            tuple(sorted(c.ck_int for c in community_cards)),
+            num_opponents
+        )
+        threshold_key = tuple(thresholds) if thresholds else None
+        cache = self._equity_cache
+        entry = cache.get(key)
+        if entry is not None:
+            equity, num_samples, cached_thresholds = entry
+            if num_samples >= self.win_prob_calc.num_simulations or cached_thresholds == threshold_key:
+                cache.move_to_end(key)
+                return equity
+        
+        result = self.win_prob_calc.calculate_win_probability(
+            hole_cards,
+            community_cards,
+            num_opponents,
+            thresholds
+        )
+        num_samples = int(result['wins'] + result['ties'] + result['losses'])
+        cache[key] = (result['equity'], num_samples, threshold_key)
+        cache.move_to_end(key)
+        if len(cache) > BOT_EQUITY_CACHE_SIZE:
+            cache.popitem(last=False)
+        return result['equity']
     
     def _evaluate_hand_strength(
         self,
@@ -157,12 +359,7 @@ class PokerBot:
             # Pre-flop: evaluate based on hole cards
             return self._preflop_hand_strength(hole_cards)
         
-        best_hand = HandEvaluator.find_best_hand(hole_cards, community_cards)
-        if not best_hand:
-            return 0.0
-        
-        hand_type = best_hand[0]
-        rank = HandEvaluator.HAND_RANKS.get(hand_type, 1)
+        rank = self._made_hand_rank(hole_cards, community_cards)
         
         # Normalize to 0-1 scale
         return rank / 10.0
@@ -172,33 +369,11 @@ class PokerBot:
         if len(hole_cards) != 2:
             return 0.0
         
-        r1, r2 = hole_cards[0].rank, hole_cards[1].rank
-        rank_values = {'2': 2, '3': 3, '4': 4, '5': 5, '6': 6, '7': 7, '8': 8,
-                       '9': 9, '10': 10, 'J': 11, 'Q': 12, 'K': 13, 'A': 14}
-        
-        v1, v2 = rank_values[r1], rank_values[r2]
-        is_pair = r1 == r2
-        is_suited = hole_cards[0].suit == hole_cards[1].suit
-        
-        # Evaluate: AA-KK pairs = 1.0, AK suited = 0.90, down to 32o = 0.05
-        if is_pair:
-            high_value = max(v1, v2)
-            return 0.60 + (high_value - 2) / 12.0 * 0.40  # Pairs: 0.60-1.0
-        elif v1 == 14 or v2 == 14:
-            # Ace
-            low_value = min(v1, v2)
-            base = 0.75 if low_value >= 10 else 0.50 if low_value >= 6 else 0.35
-            return base + (0.15 if is_suited else 0.0)
-        elif v1 >= 12 or v2 >= 12:
-            # KQ, KJ, QJ
-            base = 0.55
-            return base + (0.10 if is_suited else 0.0)
-        elif is_suited:
-            high_value = max(v1, v2)
-            return 0.30 + (high_value - 2) / 12.0 * 0.20
-        else:
-            high_value = max(v1, v2)
-            return 0.15 + (high_value - 2) / 12.0 * 0.15
+        card1, card2 = hole_cards
+        v1, v2 = card1.rank_int, card2.rank_int
+        is_suited = card1.suit == card2.suit
+        strength = self._PREFLOP_TABLE[((v1 - 2) * 13 + (v2 - 2)) * 2 + is_suited]
+        return strength / PREFLOP_SCALE
     
     def _simple_hand_strength(
         self,
@@ -206,18 +381,18 @@ class PokerBot:
         community_cards: List[Card]
     ) -> float:
         """Simple fallback hand strength evaluation"""
-        best_hand = HandEvaluator.find_best_hand(hole_cards, community_cards)
-        if not best_hand:
-            return 0.0
-        rank = HandEvaluator.HAND_RANKS.get(best_hand[0], 1)
-        return rank / 10.0
+        return self._made_hand_rank(hole_cards, community_cards) / 10.0
     
-    def _get_position_multiplier(self, position: str) -> float:
+    @staticmethod
+    def _made_hand_rank(hole_cards: List[Card], community_cards: List[Card]) -> int:
         """
-        Get position multiplier for hand selection
-        Early position = tighter (0.5), late = looser (1.5)
+        HandEvaluator.HAND_RANKS value (1-10) of the best 5-card hand,
+        or 0 with fewer than 5 cards
         """
-        return {"early": 0.5, "middle": 0.8, "late": 1.3}.get(position, 0.8)
+        cards = [c.ck_int for c in hole_cards] + [c.ck_int for c in community_cards]
+        if len(cards) < 5:
+            return 0
+        return HAND_RANK_OF_RANK[evaluate_texas_cards(cards)]
     
     def _make_decision(
         self,
@@ -232,37 +407,11 @@ class PokerBot:
         is_preflop: bool,
         current_bet: int
     ) -> Tuple[str, Optional[int]]:
-        """Make final decision based on all factors"""
-        
-        # Fold threshold adjusted by tightness and position
-        fold_threshold = (0.35 + (self.type.tightness * 0.30)) * position_multiplier
-        
-        # If checking is available, decide check vs bet
-        if to_call == 0:
-            return self._decide_check_or_bet(
-                equity, hand_strength, num_opponents, player_stack, current_bet
-            )
-        
-        # Fold decision
-        if equity < fold_threshold:
-            return ("fold", None)
-        
-        # Call threshold - compare equity to pot odds
-        # If equity > pot_odds, it's +EV to call
-        call_threshold = pot_odds * 0.8  # Require slightly better odds due to variance
-        
-        if equity >= call_threshold or equity > 0.5:
-            # Consider raising
-            if random.random() < self.type.aggression and hand_strength > 0.4:
-                raise_amount = self._calculate_raise_amount(
-                    to_call, player_stack, pot_odds, hand_strength
-                )
-                return ("raise", raise_amount)
-            else:
-                return ("call", None)
-        else:
-            # Fold if equity is too low
-            return ("fold", None)
+        """Make final decision based on all factors (see _build_decide_fn)"""
+        return self._decide_fn(
+            to_call, player_stack, equity, hand_strength, pot_odds, stack_depth,
+            position_multiplier, num_opponents, is_preflop, current_bet
+        )
     
     def _decide_check_or_bet(
         self,
@@ -275,8 +424,8 @@ class PokerBot:
         """Decide between checking and betting when it's free"""
         
         # Strong hands should bet
-        if hand_strength > 0.65 or (equity > 0.65 and num_opponents <= 2):
-            if random.random() < self.type.aggression:
+        if hand_strength > 0.65 or (equity > self.BET_EQUITY and num_opponents <= 2):
+            if self._next_rand() < self.type.aggression:
                 # Bet
                 bet_size = int(player_stack * 0.25)
                 return ("raise", bet_size)
@@ -321,7 +470,17 @@ class PokerBot:
     ) -> Tuple[str, Optional[int]]:
         """Decide when all-in is forced (to_call > stack)"""
         
-        equity = self._get_equity(hole_cards, community_cards, num_opponents)
+        # Cheap estimate first: pre-flop strength, or the made hand's typical
+        # heads-up equity, which has to hold up against every opponent
+        if len(community_cards) < 3:
+            heads_up = self._preflop_hand_strength(hole_cards)
+        else:
+            heads_up = self._MADE_HAND_EQUITY[self._made_hand_rank(hole_cards, community_cards)]
+        equity = heads_up ** num_opponents
+        
+        # Only pay for Monte Carlo when the estimate is near the threshold
+        if 0.35 < equity < 0.45:
+            equity = self._get_equity(hole_cards, community_cards, num_opponents)
         
         # Call if equity suggests it's close or we have reasonable pot odds
         # Otherwise fold if we have time to make the decision
@@ -337,33 +496,108 @@ class PokerBot:
 class BotManager:
     """Manages a pool of poker bots with varied types"""
     
-    def __init__(self, num_bots: int, mixed_types: bool = True):
+    def __init__(self, num_bots: int, mixed_types: bool = True, seed: Optional[int] = None):
         """
         Create a pool of bots
         
         Args:
             num_bots: Number of bots to create
             mixed_types: If True, assign different types; if False, all same
+            seed: Seed for every bot's own streams (None for unseeded bots)
         """
-        self.bots = []
+        self.bots: List[PokerBot] = []
+        rng = random.Random(seed)
+        
+        def bot_seed() -> Optional[int]:
+            return rng.getrandbits(32) if seed is not None else None
         
         if mixed_types:
             # Distribute types evenly across bots
             type_names = list(PokerBot.TYPES.keys())
             for i in range(num_bots):
                 bot_type = type_names[i % len(type_names)]
-                self.bots.append(PokerBot(i, bot_type))
+                self.bots.append(PokerBot(i, bot_type, seed=bot_seed()))
         else:
             # Random assignment to each bot
             for i in range(num_bots):
-                self.bots.append(PokerBot(i))
+                self.bots.append(PokerBot(i, seed=bot_seed()))
+        
+        # Player ID -> index into self.bots (a bot's slot)
+        self._slot_by_id: Dict[int, int] = {bot.player_id: slot for slot, bot in enumerate(self.bots)}
+        
+        # Per-bot fold bias (Q0.7) by slot, for the fold checks decide_all
+        # makes across the whole pool
+        self._fold_bias_q7 = array('b', [bot.type.fold_bias_q7 for bot in self.bots])
     
     def get_bot(self, player_id: int) -> Optional[PokerBot]:
         """Get a bot by player ID"""
-        for bot in self.bots:
-            if bot.player_id == player_id:
-                return bot
-        return None
+        slot = self._slot_by_id.get(player_id)
+        return None if slot is None else self.bots[slot]
+    
+    def decide_all(
+        self,
+        hole_cards: Dict[int, List[Card]],
+        community_cards: List[Card],
+        current_bet: int,
+        to_call: Dict[int, int],
+        player_stacks: Dict[int, int],
+        pot: int,
+        position_idx: Dict[int, int],
+        small_blind: int,
+        big_blind: int
+    ) -> Dict[int, Tuple[str, Optional[int]]]:
+        """
+        Decide for every bot in hole_cards against one shared game state
+        (simulation/training mode, where all seats act on the same board)
+        
+        Facing a bet, a bot whose equity is under its fold threshold is
+        folded straight from the _fold_bias_q7 array; everyone else goes
+        through PokerBot.decide_action, which reuses the equity cached here
+        (simulated against the same thresholds decide_action would use), so
+        the result matches calling decide_action for each bot.
+        
+        Args:
+            hole_cards: Player ID -> that bot's 2 hole cards
+            community_cards: Current community cards (0-5)
+            current_bet: Current bet amount to match
+            to_call: Player ID -> amount that bot needs to call
+            player_stacks: Player ID -> that bot's remaining stack
+            pot: Current pot size
+            position_idx: Player ID -> position index (see poker_game.POSITIONS)
+            small_blind: Small blind amount
+            big_blind: Big blind amount
+        
+        Returns:
+            Player ID -> (action, raise_amount), as from decide_action
+        """
+        num_opponents = len(hole_cards) - 1
+        fold_bias_q7 = self._fold_bias_q7
+        decisions: Dict[int, Tuple[str, Optional[int]]] = {}
+        for player_id, cards in hole_cards.items():
+            slot = self._slot_by_id[player_id]
+            bot = self.bots[slot]
+            owed = to_call[player_id]
+            stack = player_stacks[player_id]
+            if 0 < owed <= stack:
+                position_multiplier = _POS_MULT[position_idx[player_id]]
+                thresholds = bot._equity_thresholds(owed, owed / (pot + owed), position_multiplier)
+                equity = bot._get_equity(cards, community_cards, num_opponents, thresholds)
+                if equity * Q7_SCALE < fold_bias_q7[slot] * position_multiplier:
+                    decisions[player_id] = ("fold", None)
+                    continue
+            decisions[player_id] = bot.decide_action(
+                hole_cards=cards,
+                community_cards=community_cards,
+                current_bet=current_bet,
+                to_call=owed,
+                player_stack=stack,
+                pot=pot,
+                position_idx=position_idx[player_id],
+                num_opponents=num_opponents,
+                small_blind=small_blind,
+                big_blind=big_blind
+            )
+        return decisions
 
 
 if __name__ == "__main__":
@@ -1,127 +1,398 @@
 import random
+from array import array
+from functools import lru_cache
 from itertools import combinations
+from types import MappingProxyType
 from typing import Optional, Tuple, List
 
+from config import NUM_SIMULATIONS_BOT
+from hand_eval import (
+    CK_PRIMES, HAND_RANKS, HAND_NAMES, CATEGORY_OF_RANK, HAND_RANK_OF_RANK, evaluate5, evaluate5_batch,
+    evaluate_texas_cards, HIGH_CARD, ONE_PAIR, TWO_PAIR, THREE_OF_A_KIND, STRAIGHT, FLUSH, FULL_HOUSE,
+    FOUR_OF_A_KIND, STRAIGHT_FLUSH, ROYAL_FLUSH
+)
+
+# Seat positions relative to the button, by position index
+POSITIONS = ("early", "middle", "late")
+POSITION_EARLY, POSITION_MIDDLE, POSITION_LATE = 0, 1, 2
+
+# Numeric value of each rank (2..14, ace high), read-only
+RANK_VALUES = MappingProxyType({
+    '2': 2, '3': 3, '4': 4, '5': 5, '6': 6, '7': 7, '8': 8,
+    '9': 9, '10': 10, 'J': 11, 'Q': 12, 'K': 13, 'A': 14
+})
+
+# Index of each suit in Card.SUITS, read-only
+SUIT_INDEX = MappingProxyType({'Hearts': 0, 'Diamonds': 1, 'Clubs': 2, 'Spades': 3})
+
+# Index tuples of every 5-card subset of 5, 6 or 7 cards, by card count
+IDX5_OF = {n: tuple(combinations(range(n), 5)) for n in (5, 6, 7)}
+
+# Bit of each rank index in a 13-bit rank mask
+RANK_BIT = tuple(1 << i for i in range(13))
+
+# Rank masks of the ten straights: 2-6 up to 10-A, plus the wheel A-2-3-4-5
+STRAIGHT_MASKS = frozenset([0x1F << i for i in range(9)] + [0x100F])
+
 class Card:
     SUITS = ['Hearts', 'Diamonds', 'Clubs', 'Spades']
     RANKS = ['2', '3', '4', '5', '6', '7', '8', '9', '10', 'J', 'Q', 'K', 'A']
+    SUITS_SET = frozenset(SUITS)
+    RANKS_SET = frozenset(RANKS)
 
     def __init__(self, suit, rank):
-        if suit not in self.SUITS:
+        if suit not in self.SUITS_SET:
             raise ValueError(f"Invalid suit: {suit}")
-        if rank not in self.RANKS:
+        if rank not in self.RANKS_SET:
             raise ValueError(f"Invalid rank: {rank}")
-        self.suit = suit
-        self.rank = rank
+        self._set_indices(RANK_VALUES[rank] - 2, SUIT_INDEX[suit])
+
+    @classmethod
+    def _fast(cls, rank_idx, suit_idx):
+        """Build a card from trusted RANKS/SUITS indices, skipping validation"""
+        card = cls.__new__(cls)
+        card._set_indices(rank_idx, suit_idx)
+        return card
+
+    def _set_indices(self, rank_idx, suit_idx):
+        self.suit = self.SUITS[suit_idx]
+        self.rank = self.RANKS[rank_idx]
+        self.rank_int = rank_idx + 2
+        self.rank_idx = rank_idx  # index into RANKS (0-12)
+        self.suit_idx = suit_idx  # index into SUITS (0-3)
+        # Cactus-Kev encoding: rank bit (16-28) | suit bit (12-15) | rank index (8-11) | rank prime (0-7)
+        self.ck_int = (1 << (16 + rank_idx)) | (0x1000 << suit_idx) | (rank_idx << 8) | CK_PRIMES[rank_idx]
+        # One bit per card in a 52-bit card set (bit = suit index * 13 + rank index)
+        self.mask = 1 << (suit_idx * 13 + rank_idx)
 
     def __repr__(self):
-        return f"{self.rank}{self.suit[0]}"
+        return _CARD_STR[self.suit_idx * 13 + self.rank_idx]
+
+
+# Display string of each card ("10S", "AH", ...), in card-mask bit order
+_CARD_STR = tuple(f"{rank}{suit[0]}" for suit in Card.SUITS for rank in Card.RANKS)
+
+
+# One shared Card per card, in card-mask bit order; decks copy it instead of rebuilding
+_MASTER = tuple(Card._fast(rank_idx, suit_idx) for suit_idx in range(4) for rank_idx in range(13))
 
 
 class Deck:
-    def __init__(self):
-        self.cards = [Card(suit, rank) for suit in Card.SUITS for rank in Card.RANKS]
+    def __init__(self, rng=None):
+        self.cards = list(_MASTER)
+        self._idx = 0  # Cards before this position have been dealt
+        self._rng = rng if rng is not None else random.Random()
         self.shuffle()
 
     def shuffle(self):
-        random.shuffle(self.cards)
+        self._rng.shuffle(self.cards)
+        self._idx = 0
 
     def deal(self, num_cards):
-        if num_cards > len(self.cards):
+        start = self._idx
+        if start + num_cards > len(self.cards):
             raise ValueError("Not enough cards in the deck to deal")
-        dealt_cards = self.cards[:num_cards]
-        self.cards = self.cards[num_cards:]
-        return dealt_cards
+        self._idx = start + num_cards
+        return self.cards[start:self._idx]
 
 
 class HandEvaluator:
-    HAND_RANKS = {
-        "High Card": 1,
-        "One Pair": 2,
-        "Two Pair": 3,
-        "Three of a Kind": 4,
-        "Straight": 5,
-        "Flush": 6,
-        "Full House": 7,
-        "Four of a Kind": 8,
-        "Straight Flush": 9,
-        "Royal Flush": 10
-    }
+    HAND_RANKS = HAND_RANKS  # Hand type -> 1 (High Card) .. 10 (Royal Flush)
 
     @staticmethod
     def find_best_hand(hole_cards, community_cards):
-        """Find the best 5-card hand from 7 cards (2 hole + 5 community)"""
+        """Find the best 5-card hand from 7 cards (2 hole + 5 community): (hand_type, cards, tiebreaker)
+
+        tiebreaker is the evaluate_hand tiebreaker of the returned cards.
+        """
+        best_hand = HandEvaluator.find_best_hand_with_rank(hole_cards, community_cards)
+        if best_hand is None:
+            return None
+        return (best_hand[0], best_hand[2], best_hand[3])
+
+    @staticmethod
+    def find_best_hand_with_rank(hole_cards, community_cards):
+        """find_best_hand, plus the HAND_RANKS value: (hand_type, rank_int, cards, tiebreaker)"""
         all_cards = hole_cards + community_cards
-        best_hand: Optional[Tuple] = None
-        best_rank = 0
-        best_tiebreaker: Optional[Tuple] = None
-
-        for combo in combinations(all_cards, 5):
-            hand_info = HandEvaluator.evaluate_hand(list(combo))
-            hand_type = hand_info[0]
-            tiebreaker = hand_info[1]
-            rank_value = HandEvaluator.HAND_RANKS[hand_type]
-            
-            if best_tiebreaker is None or rank_value > best_rank or (rank_value == best_rank and tiebreaker > best_tiebreaker):
-                best_rank = rank_value
-                best_tiebreaker = tiebreaker
-                best_hand = (hand_type, list(combo))
+        if not 5 <= len(all_cards) <= 7:
+            return None
+        # The table evaluator gives the best rank up front, so the combo scan
+        # stops at the first combo reaching it instead of scoring all 21
+        cks = [card.ck_int for card in all_cards]
+        best_rank = evaluate_texas_cards(cks)
+        best_combo: Optional[Tuple] = None
+        for i0, i1, i2, i3, i4 in IDX5_OF[len(cks)]:
+            if evaluate5(cks[i0], cks[i1], cks[i2], cks[i3], cks[i4]) == best_rank:
+                best_combo = (all_cards[i0], all_cards[i1], all_cards[i2], all_cards[i3], all_cards[i4])
+                break
+        assert best_combo is not None
+        # Only the winning combo is turned back into a hand type and tiebreaker
+        lanes = 0
+        for card in best_combo:
+            shift = card.rank_idx * 4
+            lanes += (((lanes >> shift) & 0xF) + 1) << shift
+        return (CATEGORY_OF_RANK[best_rank], HAND_RANK_OF_RANK[best_rank], list(best_combo), _rank_tiebreaker(lanes))
 
-        return best_hand
+    @staticmethod
+    @lru_cache(maxsize=4096)
+    def _best_rank_cached(hole_mask, community_mask):
+        """Cactus-Kev rank of the best hand in two card-set masks, memoized (0 if under 5 cards)
+
+        The community only changes between streets, so repeat decisions for
+        the same player within a street hit the cache.
+        """
+        cards = []
+        mask = hole_mask | community_mask
+        while mask:
+            low_bit = mask & -mask
+            cards.append(CK_DECK[low_bit.bit_length() - 1])
+            mask ^= low_bit
+        if len(cards) < 5:
+            return 0
+        return evaluate_texas_cards(cards)
+
+    @staticmethod
+    def monte_carlo_equity(hole_cards, community_cards, num_opponents=1, n=NUM_SIMULATIONS_BOT, rng=None):
+        """Average share of the pot won by hole_cards against random opponent hands over n run-outs (ties split)
+
+        Draws come from rng (a random.Random) when given, else the random module.
+        """
+        hero = [card.ck_int for card in hole_cards]
+        board = [card.ck_int for card in community_cards]
+        known = cards_to_mask(hole_cards) | cards_to_mask(community_cards)
+        deck = [ck for bit, ck in enumerate(CK_DECK) if not known >> bit & 1]
+        num_board = 5 - len(board)
+        num_drawn = num_board + 2 * num_opponents
+        sample = random.sample if rng is None else rng.sample
+        
+        share = 0.0
+        for _ in range(n):
+            drawn = sample(deck, num_drawn)
+            runout = board + drawn[:num_board]
+            hero_rank = evaluate_texas_cards(hero + runout)
+            opponent_ranks = [evaluate_texas_cards(drawn[i:i + 2] + runout) for i in range(num_board, num_drawn, 2)]
+            best_opponent = min(opponent_ranks)
+            if hero_rank < best_opponent:
+                share += 1.0
+            elif hero_rank == best_opponent:
+                share += 1.0 / (1 + opponent_ranks.count(hero_rank))
+        return share / n
+
+    @staticmethod
+    def eval5_fast(c1, c2, c3, c4, c5):
+        """Cactus-Kev rank of five Card.ck_int values: 1 (royal flush) to 7462 (7-5-4-3-2)"""
+        return evaluate5(c1, c2, c3, c4, c5)
 
     @staticmethod
     def evaluate_hand(cards):
-        """Evaluate a 5-card hand and return (hand_type, tiebreaker_values)"""
-        ranks = [Card.RANKS.index(card.rank) for card in cards]
-        suits = [card.suit for card in cards]
-        rank_counts = {}
-        for r in ranks:
-            rank_counts[r] = rank_counts.get(r, 0) + 1
-
-        counts = sorted(rank_counts.values(), reverse=True)
-        is_flush = len(set(suits)) == 1
+        """Evaluate a 5-card hand and return (hand category, tiebreaker_values)
+
+        The category is an int (HIGH_CARD .. ROYAL_FLUSH); HAND_NAMES[category]
+        gives its display name.
+        """
+        # SWAR rank histogram: rank r owns the 4-bit lane at r*4, which holds
+        # 2**count - 1 (1, 3, 7, 15) so lane sums mod 15 identify the count pattern
+        lanes = 0
+        rank_bits = 0
+        suit_bits = 0
+        for card in cards:
+            r = card.rank_idx
+            shift = r * 4
+            lanes += (((lanes >> shift) & 0xF) + 1) << shift
+            rank_bits |= RANK_BIT[r]
+            suit_bits |= 1 << card.suit_idx
+        signature = lanes % 15 if len(cards) == 5 else None
+        
+        # Flush: exactly one suit bit set
+        is_flush = suit_bits != 0 and suit_bits & (suit_bits - 1) == 0
+        if rank_bits in STRAIGHT_MASKS:
+            straight = 2 if rank_bits == 0x1F00 else 1
+        else:
+            straight = 0
         
-        # Check for straight
-        sorted_ranks = sorted(ranks)
-        is_straight = (sorted_ranks[-1] - sorted_ranks[0] == 4 and len(set(ranks)) == 5)
-        # Check for A-2-3-4-5 straight (wheel)
-        is_wheel = sorted_ranks == [0, 1, 2, 3, 12]
-
-        # Create tiebreaker values based on card ranks in order of importance
-        sorted_by_count = sorted(rank_counts.items(), key=lambda x: (x[1], x[0]), reverse=True)
-        tiebreaker = tuple(r for r, c in sorted_by_count)
-
-        if (is_straight or is_wheel) and is_flush and 12 in ranks and 9 in ranks:
-            return ("Royal Flush", tiebreaker)
-        if (is_straight or is_wheel) and is_flush:
-            return ("Straight Flush", tiebreaker)
-        if counts == [4, 1]:
-            return ("Four of a Kind", tiebreaker)
-        if counts == [3, 2]:
-            return ("Full House", tiebreaker)
-        if is_flush:
-            return ("Flush", tuple(sorted(ranks, reverse=True)))
-        if is_straight or is_wheel:
-            return ("Straight", tiebreaker)
-        if counts == [3, 1, 1]:
-            return ("Three of a Kind", tiebreaker)
-        if counts == [2, 2, 1]:
-            return ("Two Pair", tiebreaker)
-        if counts == [2, 1, 1, 1]:
-            return ("One Pair", tiebreaker)
-        return ("High Card", tuple(sorted(ranks, reverse=True)))
+        hand_type = _HAND_TYPE_TABLE[(_COUNT_SIGNATURES.get(signature), is_flush, straight)]
+        return (hand_type, _rank_tiebreaker(lanes))
+
+
+@lru_cache(maxsize=None)
+def _rank_tiebreaker(lanes):
+    """Rank indices by count, then by rank, high first, for a SWAR rank histogram
+
+    The lanes value identifies the rank multiset, so each tiebreaker is only
+    sorted once. Sorting packed count << 4 | rank ints avoids a key function.
+    """
+    counts = [0] * 13
+    for r in range(13):
+        counts[r] = ((lanes >> (r * 4)) & 0xF).bit_length()  # lane holds 2**count - 1
+    keys = sorted([count << 4 | r for r, count in enumerate(counts) if count], reverse=True)
+    return tuple(key & 0xF for key in keys)
+
+
+# Lane-sum signature (see HandEvaluator.evaluate_hand) -> rank-count pattern
+_COUNT_SIGNATURES = {1: "4-1", 10: "3-2", 9: "3-1-1", 7: "2-2-1", 6: "2-1-1-1"}
+
+
+def _build_hand_type_table():
+    """Map (count pattern, is_flush, straight) to a hand category.
+
+    straight is 0 (none), 1 (straight) or 2 (ace-high straight); a count
+    pattern of None means no repeated rank. Impossible combinations are
+    included too, resolved in the usual precedence order.
+    """
+    paired_types = {
+        "4-1": FOUR_OF_A_KIND, "3-2": FULL_HOUSE, "3-1-1": THREE_OF_A_KIND,
+        "2-2-1": TWO_PAIR, "2-1-1-1": ONE_PAIR,
+    }
+    table = {}
+    for pattern in (None, *paired_types):
+        for is_flush in (False, True):
+            for straight in (0, 1, 2):
+                if straight and is_flush:
+                    hand_type = ROYAL_FLUSH if straight == 2 else STRAIGHT_FLUSH
+                elif pattern in ("4-1", "3-2"):
+                    hand_type = paired_types[pattern]
+                elif is_flush:
+                    hand_type = FLUSH
+                elif straight:
+                    hand_type = STRAIGHT
+                elif pattern is not None:
+                    hand_type = paired_types[pattern]
+                else:
+                    hand_type = HIGH_CARD
+                table[(pattern, is_flush, straight)] = hand_type
+    return table
+
+
+_HAND_TYPE_TABLE = _build_hand_type_table()
+
+
+# Canonical Card for each card-mask bit position
+_MASK_CARDS = _MASTER
+
+# Cactus-Kev ints of a full deck, in card-mask bit order
+CK_DECK = tuple(card.ck_int for card in _MASK_CARDS)
+
+
+def cards_to_mask(cards):
+    """Combine Card.mask bits into a single card-set mask"""
+    mask = 0
+    for card in cards:
+        mask |= card.mask
+    return mask
+
+
+@lru_cache(maxsize=1 << 20)
+def evaluate_mask(mask):
+    """HandEvaluator.evaluate_hand for the cards in a card-set mask, memoized"""
+    cards = []
+    while mask:
+        low_bit = mask & -mask
+        cards.append(_MASK_CARDS[low_bit.bit_length() - 1])
+        mask ^= low_bit
+    return HandEvaluator.evaluate_hand(cards)
+
+
+def side_pot_levels(bets, folded_mask=0):
+    """Split per-player bets into pots, smallest bet level first.
+    
+    bets[i] is player i's total bet; bit i of folded_mask marks player i
+    as folded (folded players are left out of every pot). Returns
+    parallel arrays of pot amounts and eligible-player bitmasks.
+    """
+    amounts = array('q')
+    masks = array('Q')
+    live = sorted((bet, i) for i, bet in enumerate(bets) if not folded_mask >> i & 1)
+    
+    eligible_mask = 0
+    for _, i in live:
+        eligible_mask |= 1 << i
+    eligible_count = len(live)
+    previous_level = 0
+    idx = 0
+    while idx < len(live):
+        level = live[idx][0]
+        pot_amount = (level - previous_level) * eligible_count
+        if pot_amount > 0:
+            amounts.append(pot_amount)
+            masks.append(eligible_mask)
+        previous_level = level
+        # Players whose whole bet is covered by this level drop out of later pots
+        while idx < len(live) and live[idx][0] == level:
+            eligible_mask &= ~(1 << live[idx][1])
+            eligible_count -= 1
+            idx += 1
+    return amounts, masks
 
 
 class Player:
     def __init__(self, player_id, stack, is_ai=True):
         self.player_id = player_id
-        self.stack = stack
+        # Owning PokerGame; once set, stack, round bet and folded/all-in flags
+        # live in its per-seat arrays (and its alive_mask tracks the stack)
+        self._game = None
+        self._stack = stack
+        self._total_bet_this_round = 0
+        self._is_folded = False
+        self._is_all_in = False
         self.is_ai = is_ai
         self.hole_cards = []
         self.bet_amount = 0
-        self.total_bet_this_round = 0
-        self.is_folded = False
-        self.is_all_in = False
+
+    @property
+    def stack(self):
+        game = self._game
+        return self._stack if game is None else game.stacks[self.player_id]
+
+    @stack.setter
+    def stack(self, value):
+        game = self._game
+        if game is None:
+            self._stack = value
+            return
+        game.stacks[self.player_id] = value
+        if value > 0:
+            game.alive_mask |= 1 << self.player_id
+        else:
+            game.alive_mask &= ~(1 << self.player_id)
+
+    @property
+    def total_bet_this_round(self):
+        game = self._game
+        return self._total_bet_this_round if game is None else game.round_bets[self.player_id]
+
+    @total_bet_this_round.setter
+    def total_bet_this_round(self, value):
+        game = self._game
+        if game is None:
+            self._total_bet_this_round = value
+        else:
+            game.round_bets[self.player_id] = value
+
+    @property
+    def is_folded(self):
+        game = self._game
+        return self._is_folded if game is None else bool(game.folded[self.player_id])
+
+    @is_folded.setter
+    def is_folded(self, value):
+        game = self._game
+        if game is None:
+            self._is_folded = value
+        else:
+            game.folded[self.player_id] = value
+
+    @property
+    def is_all_in(self):
+        game = self._game
+        return self._is_all_in if game is None else bool(game.all_in[self.player_id])
+
+    @is_all_in.setter
+    def is_all_in(self, value):
+        game = self._game
+        if game is None:
+            self._is_all_in = value
+        else:
+            game.all_in[self.player_id] = value
 
     def receive_cards(self, cards):
         self.hole_cards = cards
@@ -138,10 +409,25 @@ class Player:
 
 
 class PokerGame:
-    DEBUG = False  # Toggle for print output
+    DEBUG = False  # Toggle for print output (per game with the verbose argument)
     
-    def __init__(self, num_players=3, starting_stack=1000, small_blind=5, big_blind=10, use_bots=True):
+    def __init__(self, num_players=3, starting_stack=1000, small_blind=5, big_blind=10, use_bots=True, verbose=None,
+                 seed=None):
+        if verbose is not None:
+            self.DEBUG = verbose
+        # Shuffles and fallback-AI draws; a seed also seeds each bot (its draws and its equity simulations)
+        self.rng = random.Random(seed)
         self.players = [Player(i, starting_stack) for i in range(num_players)]
+        # Per-seat state, indexed by player_id (Player attributes read and write these)
+        self.stacks = array('q', [starting_stack]) * num_players
+        self.round_bets = array('q', [0]) * num_players
+        self.folded = array('b', [0]) * num_players
+        self.all_in = array('b', [0]) * num_players
+        self.alive_mask = 0  # Bit i set while player i has chips (kept up to date by Player.stack)
+        for player in self.players:
+            player._game = self
+            if player.stack > 0:
+                self.alive_mask |= 1 << player.player_id
         self.small_blind = small_blind
         self.big_blind = big_blind
         self.pot = 0
@@ -150,7 +436,7 @@ class PokerGame:
         self.button = 0
         self.current_bet = 0
         self.hand_number = 0
-        self.side_pots: List = []  # List of {amount, eligible_players}
+        self.side_pots: List = []  # List of {amount, eligible_players, eligible_mask}
         self.total_bet_by_player = {}  # Track total bet amount per player for side pot calculation
         self.pending_raise_amount = 0  # Temporary storage for bot raise amounts
         
@@ -159,15 +445,15 @@ class PokerGame:
         self.bots = {}  # Map player_id to PokerBot instance
         
         if use_bots:
-            self._initialize_bots(num_players)
+            self._initialize_bots(num_players, seeded=seed is not None)
 
     def _assert_deck(self) -> Deck:
         """Assert deck is initialized and return it"""
         assert self.deck is not None, "Deck must be initialized before use"
         return self.deck
 
-    def _initialize_bots(self, num_players: int):
-        """Initialize poker bots for AI players"""
+    def _initialize_bots(self, num_players: int, seeded: bool = False):
+        """Initialize poker bots for AI players (seeded from self.rng when seeded)"""
         try:
             from poker_bot import PokerBot
             
@@ -176,12 +462,17 @@ class PokerGame:
             
             for i in range(1, num_players):  # Player 0 is the human
                 bot_type = bot_types[(i - 1) % len(bot_types)]
-                self.bots[i] = PokerBot(i, bot_type)
+                bot_seed = self.rng.getrandbits(32) if seeded else None
+                self.bots[i] = PokerBot(i, bot_type, seed=bot_seed)
         except ImportError:
             if self.DEBUG:
                 print("Warning: poker_bot module not found, using simple AI")
             self.use_bots = False
 
+    def alive_count(self) -> int:
+        """Number of players who still have chips"""
+        return bin(self.alive_mask).count("1")
+
     def get_active_players(self) -> List:
         """Get all active players (not folded, with stack > 0)"""
         return [p for p in self.players if not p.is_folded and p.stack > 0]
@@ -200,33 +491,25 @@ class PokerGame:
 
     def create_side_pots(self):
         """Create side pots based on all-in players' contributions"""
-        # Get all non-folded players sorted by their total bet
+        # Only non-folded players contest (and fund) the pots
         active_players = self.get_unfolded_players()
         if len(active_players) <= 1:
             return []
         
-        # Sort by total bet amount (ascending)
-        bet_levels = sorted(set(p.total_bet_this_round for p in active_players))
+        bets = [p.total_bet_this_round for p in self.players]
+        folded_mask = 0
+        for i, player in enumerate(self.players):
+            if player.is_folded:
+                folded_mask |= 1 << i
+        amounts, masks = side_pot_levels(bets, folded_mask)
         
         pots = []
-        previous_level = 0
-        
-        for level in bet_levels:
-            # Create pot for this level
-            eligible = [p for p in active_players if p.total_bet_this_round >= level]
-            
-            if not eligible:
-                continue
-                
-            pot_amount = (level - previous_level) * len(eligible)
-            
-            if pot_amount > 0:
-                pots.append({
-                    'amount': pot_amount,
-                    'eligible_players': [p.player_id for p in eligible]
-                })
-            
-            previous_level = level
+        for pot_amount, eligible_mask in zip(amounts, masks):
+            pots.append({
+                'amount': pot_amount,
+                'eligible_players': [p.player_id for i, p in enumerate(self.players) if eligible_mask >> i & 1],
+                'eligible_mask': eligible_mask  # Bit i set if player i is eligible
+            })
         
         return pots
 
@@ -258,7 +541,9 @@ class PokerGame:
 
     def deal_hole_cards(self):
         """Deal 2 cards to each player"""
-        self.deck = Deck()
+        self.deck = Deck(self.rng)
+        for bot in self.bots.values():
+            bot.reset_hand()
         for player in self.players:
             cards = self.deck.deal(2)
             player.receive_cards(cards)
@@ -273,7 +558,7 @@ class PokerGame:
         # Fallback to simple AI
         return self._simple_ai_decision(player, community_cards, current_bet, to_call)
     
-    def _calculate_position(self, player_idx: int, active_players_count: int) -> str:
+    def _calculate_position(self, player_idx: int, active_players_count: int) -> int:
         """
         Calculate player's position relative to button
         
@@ -282,30 +567,30 @@ class PokerGame:
             active_players_count: Number of active (non-folded) players
         
         Returns:
-            "early", "middle", or "late"
+            POSITION_EARLY, POSITION_MIDDLE, or POSITION_LATE (index into POSITIONS)
         """
         # Position relative to button
         pos_from_button = (player_idx - self.button) % len(self.players)
         
         if active_players_count <= 3:
             # Heads-up or 3-way: button is late position
-            return "late" if pos_from_button in [1, 2] else "early"
+            return POSITION_LATE if pos_from_button in [1, 2] else POSITION_EARLY
         elif active_players_count <= 6:
             # 4-6 players
             if pos_from_button in [1, 2]:
-                return "early"
+                return POSITION_EARLY
             elif pos_from_button in [3, 4]:
-                return "middle"
+                return POSITION_MIDDLE
             else:
-                return "late"
+                return POSITION_LATE
         else:
             # 7+ players
             if pos_from_button in [1, 2, 3]:
-                return "early"
+                return POSITION_EARLY
             elif pos_from_button in [4, 5]:
-                return "middle"
+                return POSITION_MIDDLE
             else:
-                return "late"
+                return POSITION_LATE
     
     def _bot_decision(self, player, community_cards, current_bet, to_call) -> str:
         """Make decision using poker bot"""
@@ -315,7 +600,7 @@ class PokerGame:
         
         # Calculate position
         active_players = [p for p in self.players if not p.is_folded]
-        position = self._calculate_position(player.player_id, len(active_players))
+        position_idx = self._calculate_position(player.player_id, len(active_players))
         num_opponents = len(active_players) - 1
         
         # Get bot decision
@@ -327,7 +612,7 @@ class PokerGame:
                 to_call=to_call,
                 player_stack=player.stack,
                 pot=self.pot,
-                position=position,
+                position_idx=position_idx,
                 num_opponents=num_opponents,
                 small_blind=self.small_blind,
                 big_blind=self.big_blind
@@ -347,22 +632,25 @@ class PokerGame:
     
     def _simple_ai_decision(self, player, community_cards, current_bet, to_call) -> str:
         """Simple AI strategy for betting (fallback)"""
+        # A made flush or better needs no simulation
+        best_rank = HandEvaluator._best_rank_cached(cards_to_mask(player.hole_cards), cards_to_mask(community_cards))
+        if HAND_RANK_OF_RANK[best_rank] >= 6 and to_call <= player.stack:
+            return "raise" if self.rng.random() > 0.5 else "call"
+
+        # Otherwise compare Monte Carlo equity with the pot odds and a fair share of the pot
+        num_opponents = max(1, len(self.get_unfolded_players()) - 1)
+        equity = HandEvaluator.monte_carlo_equity(player.hole_cards, community_cards, num_opponents, rng=self.rng)
+        pot_odds = to_call / (self.pot + to_call) if to_call > 0 else 0.0
+        fair_share = 1.0 / (num_opponents + 1)
+
         if to_call > player.stack:
             # All-in or fold
-            return "call" if random.random() > 0.7 else "fold"
-
-        # Evaluate hand strength
-        best_hand = HandEvaluator.find_best_hand(player.hole_cards, community_cards)
-        hand_strength = HandEvaluator.HAND_RANKS[best_hand[0]] if best_hand else 1
-
-        # Simple strategy
-        if hand_strength >= 6:  # Flush or better
-            return "raise" if random.random() > 0.5 else "call"
-        elif hand_strength >= 4:  # Three of a kind or better
-            return "call"
-        elif hand_strength >= 2:  # One pair
-            return "call" if to_call < self.big_blind else "fold"
-        else:  # High card
+            return "call" if equity >= pot_odds else "fold"
+        if equity >= 1.5 * fair_share:  # Well ahead of the table
+            return "raise" if self.rng.random() > 0.5 else "call"
+        elif equity >= pot_odds:
+            return "call" if to_call > 0 else "check"
+        else:
             return "fold" if to_call > 0 else "check"
 
     def betting_round(self, stage):
@@ -370,7 +658,7 @@ class PokerGame:
         if self.DEBUG:
             print(f"\n--- {stage.upper()} ---")
             print(f"Pot: ${self.pot}")
-        if self.community_cards and self.DEBUG:
+        if self.DEBUG and self.community_cards:
             print(f"Community Cards: {self.community_cards}")
 
         active_players = [p for p in self.players if not p.is_folded]
@@ -384,12 +672,26 @@ class PokerGame:
             first_to_act = (self.button + 1) % len(self.players)
 
         current_player_idx = first_to_act
-        players_who_acted_this_level = set()
+        # Bit i of each mask is seat i; they are updated as players act, so
+        # the completion check below never scans the table
+        acted_mask = 0  # Acted since the last raise
+        unfolded_mask = 0  # Still in the hand
+        acting_mask = 0  # Still in the hand and not all-in
+        matched_mask = 0  # Bet this round equals current_bet
+        folded, all_in, round_bets = self.folded, self.all_in, self.round_bets
+        for i in range(len(self.players)):
+            if not folded[i]:
+                unfolded_mask |= 1 << i
+                if not all_in[i]:
+                    acting_mask |= 1 << i
+            if round_bets[i] == self.current_bet:
+                matched_mask |= 1 << i
         
         while True:
             player = self.players[current_player_idx]
+            seat_bit = 1 << player.player_id
 
-            if player.is_folded or player.is_all_in:
+            if not acting_mask & seat_bit:
                 current_player_idx = (current_player_idx + 1) % len(self.players)
                 continue
 
@@ -417,6 +719,8 @@ class PokerGame:
 
             if action == "fold":
                 player.is_folded = True
+                unfolded_mask &= ~seat_bit
+                acting_mask &= ~seat_bit
                 if self.DEBUG:
                     print(f"Player {player.player_id} folds")
             elif action == "call":
@@ -427,11 +731,16 @@ class PokerGame:
                     self.pot += bet_amount
                     if bet_amount == to_call and player.stack == 0:
                         player.is_all_in = True
+                        acting_mask &= ~seat_bit
                         if self.DEBUG:
                             print(f"Player {player.player_id} goes all-in with ${bet_amount}")
                     elif self.DEBUG:
                         print(f"Player {player.player_id} calls ${bet_amount}")
+                    if player.total_bet_this_round > self.current_bet:
+                        matched_mask = 0
                     self.current_bet = max(self.current_bet, player.total_bet_this_round)
+                    if player.total_bet_this_round == self.current_bet:
+                        matched_mask |= seat_bit
             elif action == "raise":
                 if player.is_ai:
                     # Use pending raise amount from bot if available
@@ -446,14 +755,26 @@ class PokerGame:
                 player.stack -= bet_amount
                 player.total_bet_this_round += bet_amount
                 self.pot += bet_amount
+                previous_bet = self.current_bet
                 self.current_bet = player.total_bet_this_round
+                if self.current_bet > previous_bet:
+                    matched_mask = seat_bit
+                elif self.current_bet == previous_bet:
+                    matched_mask |= seat_bit
+                else:
+                    # A short all-in "raise" lowered current_bet: recount who matches it
+                    matched_mask = 0
+                    for i, bet in enumerate(round_bets):
+                        if bet == self.current_bet:
+                            matched_mask |= 1 << i
                 if player.stack == 0:
                     player.is_all_in = True
+                    acting_mask &= ~seat_bit
                     if self.DEBUG:
                         print(f"Player {player.player_id} goes all-in with raise to ${player.total_bet_this_round}")
                 elif self.DEBUG:
                     print(f"Player {player.player_id} raises to ${player.total_bet_this_round}")
-                players_who_acted_this_level = {player.player_id}  # Reset who has acted
+                acted_mask = 0  # Reset who has acted
             elif action == "check":
                 if to_call == 0:
                     if self.DEBUG:
@@ -462,34 +783,35 @@ class PokerGame:
                     if self.DEBUG:
                         print(f"Player {player.player_id} can't check, must call or fold")
 
-            players_who_acted_this_level.add(player.player_id)
+            acted_mask |= seat_bit
             
-            # Check if betting round is complete
-            active_players = [p for p in self.players if not p.is_folded]
-            if len(active_players) <= 1:
+            # Round is over with at most one player in the hand or able to act
+            # (x & (x - 1) clears the lowest set bit, so it is 0 for 0 or 1 bits)
+            if not unfolded_mask & (unfolded_mask - 1) or not acting_mask & (acting_mask - 1):
                 break
             
-            # Check if all non-folded, non-all-in players have acted
-            players_still_acting = [p for p in self.players if not p.is_folded and not p.is_all_in]
-            if len(players_still_acting) <= 1:
+            # ...or once everyone able to act has acted and matched the current bet
+            if acted_mask & matched_mask & acting_mask == acting_mask:
                 break
-                
-            if all(p.player_id in players_who_acted_this_level for p in players_still_acting):
-                all_matched = all(
-                    p.total_bet_this_round == self.current_bet 
-                    for p in players_still_acting
-                )
-                if all_matched:
-                    break
             
             current_player_idx = (current_player_idx + 1) % len(self.players)
 
     def reset_round_bets(self):
         """Reset player bets for next betting round"""
-        for player in self.players:
-            player.total_bet_this_round = 0
+        round_bets = self.round_bets
+        round_bets[:] = array('q', [0]) * len(round_bets)
         self.current_bet = 0
 
+    def reset_players_for_new_hand(self):
+        """Player.reset_for_new_hand for every seat, clearing the per-seat arrays in one assignment each"""
+        num_seats = len(self.players)
+        self.round_bets[:] = array('q', [0]) * num_seats
+        self.folded[:] = array('b', [0]) * num_seats
+        self.all_in[:] = array('b', [0]) * num_seats
+        for player in self.players:
+            player.hole_cards = []
+            player.bet_amount = 0
+
     def determine_winner(self):
         """Determine winner with side pots support"""
         active_players = [p for p in self.players if not p.is_folded]
@@ -509,6 +831,16 @@ class PokerGame:
         
         total_distributed = 0
         
+        # Rank every showdown hand once, in one pass, for all pots (lower is better)
+        board = [card.ck_int for card in self.community_cards]
+        showdown_ranks = dict(zip(
+            (p.player_id for p in active_players),
+            map(evaluate_texas_cards, [[c.ck_int for c in p.hole_cards] + board for p in active_players])
+        ))
+        if self.DEBUG:
+            for player in active_players:
+                print(f"Player {player.player_id}: {player.hole_cards} - {CATEGORY_OF_RANK[showdown_ranks[player.player_id]]}")
+        
         # Process each pot
         for pot_info in pots:
             pot_amount = pot_info['amount']
@@ -518,32 +850,9 @@ class PokerGame:
             if not eligible_players:
                 continue
             
-            # Find best hand among eligible players
-            best_hand_rank = 0
-            best_tiebreaker: Optional[Tuple] = None
-            pot_winners = []
-            winning_hand_type = ""
-            
-            for player in eligible_players:
-                best_hand = HandEvaluator.find_best_hand(player.hole_cards, self.community_cards)
-                if best_hand is None:
-                    continue
-                hand_type = best_hand[0]
-                hand_rank = HandEvaluator.HAND_RANKS[hand_type]
-                
-                hand_info = HandEvaluator.evaluate_hand(best_hand[1])
-                tiebreaker = hand_info[1]
-                
-                if self.DEBUG and pot_info == pots[0]:  # Only print hands once
-                    print(f"Player {player.player_id}: {player.hole_cards} - {hand_type}")
-                
-                if best_tiebreaker is None or hand_rank > best_hand_rank or (hand_rank == best_hand_rank and tiebreaker > best_tiebreaker):
-                    best_hand_rank = hand_rank
-                    best_tiebreaker = tiebreaker
-                    pot_winners = [player]
-                    winning_hand_type = hand_type
-                elif hand_rank == best_hand_rank and tiebreaker == best_tiebreaker:
-                    pot_winners.append(player)
+            # Best hand among eligible players; equal ranks split the pot
+            best_rank = min(showdown_ranks[p.player_id] for p in eligible_players)
+            pot_winners = [p for p in eligible_players if showdown_ranks[p.player_id] == best_rank]
             
             # Distribute pot among winners
             if len(pot_winners) == 1:
@@ -576,9 +885,11 @@ class PokerGame:
             print(f"{'='*50}")
 
         # Reset player state
-        for player in self.players:
-            player.reset_for_new_hand()
+        self.reset_players_for_new_hand()
         
+        # Hands from earlier deals cannot recur
+        HandEvaluator._best_rank_cached.cache_clear()
+
         # Reset side pots
         self.side_pots = []
         self.total_bet_by_player = {p.player_id: 0 for p in self.players}
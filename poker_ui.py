@@ -1,19 +1,51 @@
 import tkinter as tk
 from tkinter import ttk, messagebox
-import threading
-import time
 import os
+import pickle
+import concurrent.futures
+import multiprocessing
+from collections import OrderedDict
+from functools import lru_cache
+from itertools import permutations
 from typing import Optional
 from PIL import Image, ImageTk
-from poker_game import PokerGame, HandEvaluator
+from poker_game import PokerGame, HandEvaluator, CK_DECK
 from win_probability import WinProbabilityCalculator
 from config import (
     UI_WINDOW_WIDTH, UI_WINDOW_HEIGHT, UI_BG_COLOR,
     DEFAULT_AI_DELAY, NUM_SIMULATIONS_SETUP, CARDS_DIRECTORY,
-    MAX_AI_DELAY, MIN_AI_DELAY, AI_DELAY_INCREMENT
+    MAX_AI_DELAY, MIN_AI_DELAY, AI_DELAY_INCREMENT,
+    DEFAULT_AI_DELAY_NS, MAX_AI_DELAY_NS, MIN_AI_DELAY_NS,
+    CARD_IMAGE_PRELOAD, CARD_IMAGE_CACHE_PATH,
+    UI_CARD_SIZE, UI_CARD_HEIGHT, UI_CARD_BACK_COLOR, EQUITY_CACHE_SIZE,
+    EQUITY_POLL_INTERVAL_MS, EQUITY_PROCESSES, CARD_PHOTO_CACHE_SIZE
 )
 
+# Every relabelling of the four suits; equity does not change when suits are swapped
+_SUIT_PERMUTATIONS = tuple(permutations(range(4)))
+
+
+def _equity_key(hole, board, num_opponents):
+    """Canonical equity cache key: the smallest suit relabelling of the sorted hole and board cards"""
+    return min(
+        (
+            tuple(sorted((card.rank_idx, perm[card.suit_idx]) for card in hole)),
+            tuple(sorted((card.rank_idx, perm[card.suit_idx]) for card in board)),
+            num_opponents,
+        )
+        for perm in _SUIT_PERMUTATIONS
+    )
+
+
+@lru_cache(maxsize=1024)
+def _cards_str(cards):
+    """Display string of a tuple of cards, e.g. "AS, 10H"; cached since the same boards and hands redraw often"""
+    return ", ".join(str(card) for card in cards)
+
+
 class PokerUI:
+    NEXT_STREET = {"Pre-Flop": "Flop", "Flop": "Turn", "Turn": "River"}
+    
     def __init__(self, root):
         self.root = root
         self.root.title("Texas Hold'em Poker")
@@ -22,15 +54,31 @@ class PokerUI:
         
         self.game: Optional[PokerGame] = None
         self.game_running = False
-        self.current_player_action = None
-        self.game_thread = None
-        self.card_images = {}
-        self.photo_cache = {}  # Cache PhotoImages by card name (prevents memory leak)
-        self.game_history = []
+        self.betting_state = None  # Betting round in progress (see betting_round/_advance_betting)
+        self.card_files = {}  # Card name -> PNG path, for cards opened on demand (no CARD_IMAGE_PRELOAD)
+        self.card_atlas = None  # All card images in one PIL image (see _build_card_atlas)
+        self.card_atlas_rects = {}  # Card name -> (left, top, right, bottom) in card_atlas
+        self.photo_cache = OrderedDict()  # LRU of PhotoImages by (card name, width, height) (prevents memory leak)
+        self._pending_log = []  # History lines not yet written to history_text
+        self._display_dirty = False  # A redraw is scheduled (see update_display)
+        self._display_stage = ""  # Stage text for the scheduled redraw
         self.raise_amount = 0
         self.community_cards_cached = []  # Track currently displayed cards
         self.hand_cards_cached = []  # Track currently displayed hand cards
         self.win_probability_calculator = WinProbabilityCalculator(num_simulations=NUM_SIMULATIONS_SETUP)
+        self._cached_equity = lru_cache(maxsize=EQUITY_CACHE_SIZE)(self._calculate_equity)
+        # Equity simulations run off the Tk thread; one worker, so requests finish in order
+        self._equity_pool = concurrent.futures.ThreadPoolExecutor(max_workers=1)
+        self._pending_equity_future = None
+        # Each simulation is sharded across worker processes when there are cores to spare.
+        # Spawned rather than forked: this process already runs Tk and worker threads.
+        self._equity_processes = EQUITY_PROCESSES or (os.cpu_count() or 1) - 1
+        self._mc_pool = None
+        if self._equity_processes >= 2:
+            self._mc_pool = concurrent.futures.ProcessPoolExecutor(
+                max_workers=self._equity_processes,
+                mp_context=multiprocessing.get_context("spawn")
+            )
         self.show_equity = tk.BooleanVar(value=False)
         self.skip_next_ai_action = False  # Skip next AI action
         self.skip_to_player = False  # Skip all AI until player's turn
@@ -41,27 +89,158 @@ class PokerUI:
         self.setup_ui()
         
     def load_card_images(self):
-        """Load all card PNG images into memory"""
+        """Load all card PNG images into memory (as one atlas image when CARD_IMAGE_PRELOAD is set)"""
         cards_dir = os.path.join(os.path.dirname(__file__), CARDS_DIRECTORY)
         if os.path.exists(cards_dir):
+            if CARD_IMAGE_PRELOAD and self._load_card_image_cache(cards_dir):
+                return
+            card_images = {}
             for filename in os.listdir(cards_dir):
                 if filename.endswith(".png"):
                     card_name = filename  # Keep full filename with .png
+                    if not CARD_IMAGE_PRELOAD:
+                        # No PIL image is kept: _card_image opens the PNG when a PhotoImage is made
+                        self.card_files[card_name] = os.path.join(cards_dir, filename)
+                        continue
                     try:
-                        img = Image.open(os.path.join(cards_dir, filename))
-                        self.card_images[card_name] = img
+                        # Decode now so the pixels can be cached
+                        card_images[card_name] = self._fit_card_image(
+                            Image.open(os.path.join(cards_dir, filename)).convert("RGBA")
+                        )
                     except Exception as e:
                         print(f"Error loading card image {filename}: {e}")
+            if CARD_IMAGE_PRELOAD:
+                self._build_card_atlas(card_images)
+                self._save_card_image_cache(cards_dir)
         else:
             print(f"Card directory not found: {cards_dir}")
     
-    def get_card_photo(self, card_name):
-        """Get a cached PhotoImage for a card name (prevents duplicate image creation)"""
-        if card_name not in self.photo_cache:
-            if card_name in self.card_images:
-                img = self.card_images[card_name]
-                self.photo_cache[card_name] = ImageTk.PhotoImage(img)
-        return self.photo_cache.get(card_name)
+    def _fit_card_image(self, img):
+        """Shrink a card image to the card slot size, so PhotoImages never need resizing"""
+        img.thumbnail((UI_CARD_SIZE, UI_CARD_HEIGHT), Image.LANCZOS)
+        return img
+    
+    def _build_card_atlas(self, card_images):
+        """Paste the decoded card images into one atlas image (13 per row); only the atlas is kept"""
+        names = sorted(card_images)
+        if not names:
+            return
+        cell_w = max(img.width for img in card_images.values())
+        cell_h = max(img.height for img in card_images.values())
+        atlas = Image.new("RGBA", (13 * cell_w, -(-len(names) // 13) * cell_h))
+        for i, card_name in enumerate(names):
+            img = card_images[card_name]
+            x, y = (i % 13) * cell_w, (i // 13) * cell_h
+            atlas.paste(img, (x, y))
+            self.card_atlas_rects[card_name] = (x, y, x + img.width, y + img.height)
+        self.card_atlas = atlas
+    
+    def _card_image(self, card_name):
+        """Temporary PIL image of a card: cropped from the atlas if there is one, else read from its PNG"""
+        if self.card_atlas is not None:
+            rect = self.card_atlas_rects.get(card_name)
+            return self.card_atlas.crop(rect) if rect else None
+        path = self.card_files.get(card_name)
+        if path is None:
+            return None
+        try:
+            with Image.open(path) as img:
+                return self._fit_card_image(img.convert("RGBA"))
+        except Exception as e:
+            print(f"Error loading card image {card_name}: {e}")
+            return None
+    
+    def _card_image_sources(self, cards_dir):
+        """Map each card PNG filename to its modification time (cache validity key)"""
+        return {
+            filename: os.stat(os.path.join(cards_dir, filename)).st_mtime_ns
+            for filename in os.listdir(cards_dir) if filename.endswith(".png")
+        }
+    
+    def _load_card_image_cache(self, cards_dir) -> bool:
+        """Load the card atlas from the cache file if it matches the PNGs on disk and the slot size"""
+        cache_path = os.path.join(os.path.dirname(__file__), CARD_IMAGE_CACHE_PATH)
+        try:
+            with open(cache_path, "rb") as f:
+                cache = pickle.load(f)
+            if (cache.get("sources") != self._card_image_sources(cards_dir)
+                    or cache.get("slot") != (UI_CARD_SIZE, UI_CARD_HEIGHT)):
+                return False
+            mode, size, data = cache["atlas"]
+            self.card_atlas = Image.frombytes(mode, size, data)
+            self.card_atlas_rects = cache["rects"]
+            return True
+        except FileNotFoundError:
+            return False
+        except Exception as e:
+            print(f"Ignoring card image cache {cache_path}: {e}")
+            self.card_atlas = None
+            self.card_atlas_rects = {}
+            return False
+    
+    def _save_card_image_cache(self, cards_dir):
+        """Store the decoded card atlas so later startups skip PNG decoding"""
+        if self.card_atlas is None:
+            return
+        cache_path = os.path.join(os.path.dirname(__file__), CARD_IMAGE_CACHE_PATH)
+        cache = {
+            "sources": self._card_image_sources(cards_dir),
+            "slot": (UI_CARD_SIZE, UI_CARD_HEIGHT),
+            "atlas": (self.card_atlas.mode, self.card_atlas.size, self.card_atlas.tobytes()),
+            "rects": self.card_atlas_rects,
+        }
+        try:
+            with open(cache_path, "wb") as f:
+                pickle.dump(cache, f, protocol=pickle.HIGHEST_PROTOCOL)
+        except OSError as e:
+            print(f"Error writing card image cache {cache_path}: {e}")
+    
+    def _remember_photo(self, key, photo):
+        """Add a PhotoImage to the LRU photo_cache, dropping the least recently used past CARD_PHOTO_CACHE_SIZE
+        
+        Only a handful of cards are on screen at once; labels keep their own
+        reference, so an evicted image stays alive while it is displayed.
+        """
+        self.photo_cache[key] = photo
+        if len(self.photo_cache) > CARD_PHOTO_CACHE_SIZE:
+            self.photo_cache.popitem(last=False)
+        return photo
+    
+    def get_card_photo(self, card_name, width=UI_CARD_SIZE, height=UI_CARD_HEIGHT):
+        """Get a cached PhotoImage for a card name at a render size (prevents duplicate image creation)"""
+        key = (card_name, width, height)
+        photo = self.photo_cache.get(key)
+        if photo is not None:
+            self.photo_cache.move_to_end(key)
+            return photo
+        img = self._card_image(card_name)
+        if img is None:
+            return None
+        if img.width > width or img.height > height:
+            img = img.copy()
+            img.thumbnail((width, height), Image.LANCZOS)
+        return self._remember_photo(key, ImageTk.PhotoImage(img))
+    
+    def get_card_back_photo(self, width=UI_CARD_SIZE, height=UI_CARD_HEIGHT):
+        """Get the cached placeholder PhotoImage shown in empty card slots"""
+        key = (None, width, height)
+        photo = self.photo_cache.get(key)
+        if photo is not None:
+            self.photo_cache.move_to_end(key)
+            return photo
+        return self._remember_photo(key, ImageTk.PhotoImage(Image.new("RGB", (width, height), UI_CARD_BACK_COLOR)))
+    
+    def _show_cards(self, labels, cards):
+        """Point the pooled card labels at the cards' PhotoImages, with the placeholder in unused slots"""
+        back = self.get_card_back_photo()
+        for i, label in enumerate(labels):
+            photo = None
+            if i < len(cards):
+                photo = self.get_card_photo(self.card_to_filename(cards[i]))
+            if photo is None:
+                photo = back
+            label.configure(image=photo)
+            label.image = photo  # type: ignore[attr-defined]
     
     def setup_ui(self):
         """Setup the main UI"""
@@ -104,7 +283,8 @@ class PokerUI:
         self.game_screen = ttk.Frame(self.root)
         
         # Title
-        self.title_label = ttk.Label(self.game_screen, text="", font=("Arial", 16, "bold"))
+        self.title_var = tk.StringVar()
+        self.title_label = ttk.Label(self.game_screen, textvariable=self.title_var, font=("Arial", 16, "bold"))
         self.title_label.pack(pady=10)
         
         # Community cards
@@ -113,11 +293,20 @@ class PokerUI:
         self.community_cards_frame = tk.Frame(community_frame, bg="#2d5016", height=150)
         self.community_cards_frame.pack(pady=10, padx=5, fill=tk.X, expand=True)
         self.community_cards_frame.pack_propagate(False)  # Maintain height
-        self.community_label = ttk.Label(community_frame, text="", font=("Arial", 10))
+        # Fixed pool of card labels; updates only swap their images
+        cards_container = tk.Frame(self.community_cards_frame, bg="#2d5016")
+        cards_container.pack(expand=True)
+        self.community_card_labels = [tk.Label(cards_container, bg="#2d5016") for _ in range(5)]
+        for label in self.community_card_labels:
+            label.pack(side=tk.LEFT, padx=5)
+        self._show_cards(self.community_card_labels, [])
+        self.community_var = tk.StringVar()
+        self.community_label = ttk.Label(community_frame, textvariable=self.community_var, font=("Arial", 10))
         self.community_label.pack(pady=5)
         
         # Pot
-        self.pot_label = ttk.Label(self.game_screen, text="", font=("Arial", 14, "bold"), foreground="black")
+        self.pot_var = tk.StringVar()
+        self.pot_label = ttk.Label(self.game_screen, textvariable=self.pot_var, font=("Arial", 14, "bold"), foreground="black")
         self.pot_label.pack(pady=5)
         
         # Main content frame with left, center, and right columns
@@ -184,7 +373,8 @@ class PokerUI:
         action_frame = ttk.LabelFrame(center_frame, text="Your Action")
         action_frame.pack(pady=5, fill=tk.X)
         
-        self.action_info_label = ttk.Label(action_frame, text="", font=("Arial", 10))
+        self.action_info_var = tk.StringVar()
+        self.action_info_label = ttk.Label(action_frame, textvariable=self.action_info_var, font=("Arial", 10))
         self.action_info_label.pack(pady=5, padx=5)
         
         # Buttons
@@ -224,7 +414,12 @@ class PokerUI:
         your_hand_frame.grid(row=1, column=0, sticky="ew", pady=5)
         self.your_hand_cards_frame = tk.Frame(your_hand_frame, bg="#2d5016")
         self.your_hand_cards_frame.pack(pady=10, padx=5)
-        self.your_hand_label = ttk.Label(your_hand_frame, text="", font=("Arial", 10))
+        self.hand_card_labels = [tk.Label(self.your_hand_cards_frame, bg="#2d5016") for _ in range(2)]
+        for label in self.hand_card_labels:
+            label.pack(side=tk.LEFT, padx=10)
+        self._show_cards(self.hand_card_labels, [])
+        self.your_hand_var = tk.StringVar()
+        self.your_hand_label = ttk.Label(your_hand_frame, textvariable=self.your_hand_var, font=("Arial", 10))
         self.your_hand_label.pack(pady=5)
         
         # Raise frame
@@ -239,7 +434,8 @@ class PokerUI:
                                       variable=self.raise_var, command=self.update_raise_label)
         self.raise_slider.pack(side=tk.LEFT, fill=tk.X, expand=True, padx=5)
         
-        self.raise_amount_label = ttk.Label(self.raise_slider_frame, text="$0", width=8)
+        self.raise_amount_var = tk.StringVar(value="$0")
+        self.raise_amount_label = ttk.Label(self.raise_slider_frame, textvariable=self.raise_amount_var, width=8)
         self.raise_amount_label.pack(side=tk.LEFT, padx=5)
         
         # Raise amount entry
@@ -254,7 +450,8 @@ class PokerUI:
         ttk.Button(raise_frame, text="Raise", command=self.confirm_raise).pack(pady=5)
         
         # Message label
-        self.message_label = ttk.Label(self.game_screen, text="", font=("Arial", 10))
+        self.message_var = tk.StringVar()
+        self.message_label = ttk.Label(self.game_screen, textvariable=self.message_var, font=("Arial", 10))
         self.message_label.pack(pady=5)
         
     def start_game(self):
@@ -283,41 +480,94 @@ class PokerUI:
             self.game_screen.pack(fill=tk.BOTH, expand=True, padx=10, pady=10)
             
             self.game_running = True
-            self.game_thread = threading.Thread(target=self.play_game_loop, daemon=True)
-            self.game_thread.start()
+            self.current_hand = 0
+            self.root.after(0, self.play_next_hand)
             
         except ValueError:
             messagebox.showerror("Error", "Invalid input")
     
-    def play_game_loop(self):
-        """Main game loop - runs indefinitely"""
-        hand_num = 0
-        while self.game_running:
-            if not self.game_running:
-                break
-            hand_num += 1
-            self.current_hand = hand_num
-            self.play_single_hand()
-            self.root.after(1000)  # Brief pause between hands
+    def play_next_hand(self):
+        """Start the next hand; the hand reschedules this when it is over, so play runs indefinitely"""
+        if not self.game_running:
+            return
+        self.current_hand += 1
+        self.play_single_hand()
+    
+    def _calculate_equity(self, key):
+        """Run the equity simulation for an _equity_key (memoized as self._cached_equity)"""
+        hole, board, num_opponents = key
+        hero = [CK_DECK[suit_idx * 13 + rank_idx] for rank_idx, suit_idx in hole]
+        community = [CK_DECK[suit_idx * 13 + rank_idx] for rank_idx, suit_idx in board]
+        if self._mc_pool is not None:
+            return self.win_probability_calculator.calculate_win_probability_parallel(
+                hero, community, num_opponents, self._mc_pool, self._equity_processes
+            )
+        return self.win_probability_calculator.calculate_win_probability_ck(hero, community, num_opponents)
+    
+    def request_equity(self, player, num_opponents):
+        """Start computing the player's equity in the background; it is shown once ready
+        
+        The result is written into the current player_action_info. Until then the
+        action info shows a "calculating..." placeholder.
+        """
+        game = self._assert_game()
+        self._cancel_pending_equity()
+        key = _equity_key(player.hole_cards, game.community_cards, num_opponents)
+        future = self._equity_pool.submit(self._cached_equity, key)
+        self._pending_equity_future = future
+        self._poll_equity(future, self.player_action_info)
+    
+    def _poll_equity(self, future, action_info):
+        """Check the equity future from the Tk thread and apply it once done"""
+        if future is not self._pending_equity_future:
+            return  # Cancelled or superseded by a newer request
+        if not future.done():
+            self.root.after(EQUITY_POLL_INTERVAL_MS, self._poll_equity, future, action_info)
+            return
+        self._pending_equity_future = None
+        try:
+            result = future.result()
+        except Exception as e:
+            print(f"Error calculating win probability: {e}")
+            return
+        action_info["win_prob"] = result['win_prob']
+        action_info["equity"] = result['equity']
+        self.update_display("Equity ready")
+    
+    def _cancel_pending_equity(self):
+        """Drop the outstanding equity request so a stale result is never displayed"""
+        if self._pending_equity_future is not None:
+            self._pending_equity_future.cancel()
+            self._pending_equity_future = None
     
     def _assert_game(self) -> PokerGame:
         """Assert game is initialized and return it"""
         assert self.game is not None, "Game not initialized"
         return self.game
     
+    def _ai_delay_ns(self) -> int:
+        """Current AI delay setting in nanoseconds, clamped to the allowed range"""
+        try:
+            delay_ns = int(float(self.game_delay_var.get()) * 1_000_000_000)
+        except ValueError:
+            return DEFAULT_AI_DELAY_NS
+        return min(max(delay_ns, MIN_AI_DELAY_NS), MAX_AI_DELAY_NS)
+    
+    def _ai_delay_ms(self) -> int:
+        """Current AI delay setting in milliseconds, for scheduling with root.after"""
+        return self._ai_delay_ns() // 1_000_000
+    
     def play_single_hand(self):
-        """Play a single hand"""
+        """Start a single hand: post blinds, deal and open the pre-flop betting round"""
         game = self._assert_game()
         game.hand_number += 1
         # Don't clear history - accumulate across hands
         self.log_event(f"\n{'='*50}")
         self.log_event(f"HAND #{game.hand_number}")
         self.log_event(f"{'='*50}")
-        self.update_history_display()
         
         # Reset player state
-        for player in game.players:
-            player.reset_for_new_hand()
+        game.reset_players_for_new_hand()
         
         # Post blinds and deal
         game.post_blinds()
@@ -325,8 +575,6 @@ class PokerUI:
         # Log blinds
         small_blind_player = (game.button + 1) % len(game.players)
         big_blind_player = (game.button + 2) % len(game.players)
-        sb_player = game.players[small_blind_player]
-        bb_player = game.players[big_blind_player]
         
         self.log_event(f"Player {small_blind_player} posts small blind: ${game.small_blind}")
         self.log_event(f"Player {big_blind_player} posts big blind: ${game.big_blind}")
@@ -336,110 +584,154 @@ class PokerUI:
         game.community_cards = []
         
         self.log_event("=== PRE-FLOP ===")
-        self.update_history_display()
         self.update_display("Pre-Flop")
         self.betting_round("Pre-Flop")
-        
-        # Check if only one player remains
-        active_players = [p for p in game.players if not p.is_folded]
-        if len(active_players) == 1:
-            winner_info = game.determine_winner()
-            self._log_winner(winner_info)
-            game.button = (game.button + 1) % len(game.players)
-            game.pot = 0
-            self.update_display("Hand Over")
-            return
-        
-        # Reset for next round
-        for player in game.players:
-            player.total_bet_this_round = 0
-        game.current_bet = 0
-        
-        # Flop
-        deck = game._assert_deck()
-        game.community_cards = deck.deal(3)
-        cards_str = ", ".join(str(card) for card in game.community_cards)
-        self.log_event(f"=== FLOP: {cards_str} ===")
-        self.update_history_display()
-        self.update_display("Flop")
-        time.sleep(float(self.game_delay_var.get()))
-        self.betting_round("Flop")
-        
-        if len([p for p in game.players if not p.is_folded]) == 1:
-            winner_info = game.determine_winner()
-            self._log_winner(winner_info)
-            game.button = (game.button + 1) % len(game.players)
-            game.pot = 0
-            self.update_display("Hand Over")
-            return
-        
-        # Reset for next round
-        for player in game.players:
-            player.total_bet_this_round = 0
-        game.current_bet = 0
-        
-        # Turn
-        deck = game._assert_deck()
-        game.community_cards += deck.deal(1)
-        cards_str = ", ".join(str(card) for card in game.community_cards)
-        self.log_event(f"=== TURN: {cards_str} ===")
-        self.update_history_display()
-        self.update_display("Turn")
-        time.sleep(float(self.game_delay_var.get()))
-        self.betting_round("Turn")
-        
-        if len([p for p in game.players if not p.is_folded]) == 1:
-            winner_info = game.determine_winner()
-            self._log_winner(winner_info)
-            game.button = (game.button + 1) % len(game.players)
-            game.pot = 0
-            self.update_display("Hand Over")
-            return
+    
+    def deal_street(self, stage):
+        """Deal the community cards for the Flop, Turn or River and schedule its betting round"""
+        game = self._assert_game()
         
         # Reset for next round
         for player in game.players:
             player.total_bet_this_round = 0
         game.current_bet = 0
         
-        # River
         deck = game._assert_deck()
-        game.community_cards += deck.deal(1)
-        cards_str = ", ".join(str(card) for card in game.community_cards)
-        self.log_event(f"=== RIVER: {cards_str} ===")
-        self.update_history_display()
-        self.update_display("River")
-        time.sleep(float(self.game_delay_var.get()))
-        self.betting_round("River")
-        
-        # Showdown
-        self._reveal_all_hands()
+        if stage == "Flop":
+            game.community_cards = deck.deal(3)
+        else:
+            game.community_cards += deck.deal(1)
+        cards_str = _cards_str(tuple(game.community_cards))
+        self.log_event(f"=== {stage.upper()}: {cards_str} ===")
+        self.update_display(stage)
+        # Pause so the user can see the new cards before betting starts
+        self.root.after(self._ai_delay_ms(), self.betting_round, stage)
+    
+    def finish_hand(self, stage):
+        """Award the pot, move the button and schedule the next hand"""
+        game = self._assert_game()
+        if stage == "Showdown":
+            self._reveal_all_hands()
         winner_info = game.determine_winner()
         self._log_winner(winner_info)
         game.button = (game.button + 1) % len(game.players)
         game.pot = 0
         self.update_history_display()
-        self.update_display("Showdown")
+        self.update_display(stage)
+        self.root.after(1000, self.play_next_hand)  # Brief pause between hands
     
     def betting_round(self, stage):
-        """Execute a betting round"""
+        """Start a betting round; _advance_betting runs it one player at a time from Tk callbacks"""
         game = self._assert_game()
-        active_players = game.get_active_players()
-        if len(active_players) <= 1:
-            return
-        
         if stage == "Pre-Flop":
             first_to_act = (game.button + 3) % len(game.players)
         else:
             first_to_act = (game.button + 1) % len(game.players)
         
-        current_player_idx = first_to_act
-        players_who_acted_this_level = set()
+        # Counts kept up to date by _record_action, so no per-action player scans
+        self.betting_state = {
+            "stage": stage,
+            "current_player_idx": first_to_act,
+            "players_acted": set(),  # Unfolded players who have acted
+            "awaiting_player": False,
+            "n_active": len(game.get_active_players()),  # Not folded, chips left
+            "n_unfolded": len(game.get_unfolded_players()),
+            "n_matched": sum(  # Unfolded, bet equals game.current_bet
+                1 for p in game.players if not p.is_folded and p.total_bet_this_round == game.current_bet
+            ),
+        }
+        
+        if self.betting_state["n_active"] <= 1:
+            self._end_betting_round()
+            return
+        self._advance_betting()
+    
+    def _end_betting_round(self):
+        """Move on from a finished betting round to the next street or the end of the hand"""
+        game = self._assert_game()
+        stage = self.betting_state["stage"]
+        self.betting_state = None
+        self.update_history_display()
+        
+        if len(game.get_unfolded_players()) == 1:
+            self.finish_hand("Hand Over")
+        elif stage == "River":
+            self.finish_hand("Showdown")
+        else:
+            self.deal_street(self.NEXT_STREET[stage])
+    
+    def _record_action(self, player, was_matched, previous_bet):
+        """Update the betting_state counts after `player` (who had chips and had not folded) acted"""
+        game = self._assert_game()
+        state = self.betting_state
+        if player.is_folded:
+            state["n_unfolded"] -= 1
+            state["n_active"] -= 1
+            state["n_matched"] -= was_matched
+            state["players_acted"].discard(player.player_id)
+            return
+        
+        state["players_acted"].add(player.player_id)
+        if player.stack == 0:
+            state["n_active"] -= 1
+        if game.current_bet != previous_bet:
+            # A raise: recount who still matches the new bet (normally just the raiser)
+            state["n_matched"] = sum(
+                1 for p in game.players if not p.is_folded and p.total_bet_this_round == game.current_bet
+            )
+        else:
+            state["n_matched"] += (player.total_bet_this_round == game.current_bet) - was_matched
+    
+    def _betting_complete(self) -> bool:
+        """Whether everyone still in the hand has acted and matched the current bet"""
+        state = self.betting_state
+        if state["n_active"] <= 1 or state["n_unfolded"] <= 1:
+            return True
+        return len(state["players_acted"]) == state["n_unfolded"] == state["n_matched"]
+    
+    def _advance_betting(self, action=None):
+        """Apply `action` for the player to act (if given), then run the betting round up to the next decision
+        
+        AI actions are scheduled back into this method with root.after after the AI
+        delay; the human's action buttons call it directly.
+        """
+        state = self.betting_state
+        if not self.game_running or state is None:
+            return
+        game = self._assert_game()
+        stage = state["stage"]
+        
+        if action is not None:
+            player = game.players[state["current_player_idx"]]
+            was_matched = player.total_bet_this_round == game.current_bet
+            previous_bet = game.current_bet
+            self.process_action(player, action, stage)
+            
+            # Disable buttons after action is submitted
+            if not player.is_ai:
+                self.disable_action_buttons()
+                self._cancel_pending_equity()
+            
+            self._record_action(player, was_matched, previous_bet)
+            
+            # Check if betting round is complete
+            if self._betting_complete():
+                self._end_betting_round()
+                return
+            
+            state["current_player_idx"] = (state["current_player_idx"] + 1) % len(game.players)
+            self.update_display(stage)
+        
+        # Skipping AI turns can never reach a player who cannot act
+        human = game.players[0]
+        if human.is_folded or human.stack == 0:
+            self.skip_to_player = False
         
         while True:
-            player = game.players[current_player_idx]
+            player = game.players[state["current_player_idx"]]
             
             if player.is_folded or player.stack == 0:
-                current_player_idx = (current_player_idx + 1) % len(game.players)
+                state["current_player_idx"] = (state["current_player_idx"] + 1) % len(game.players)
                 continue
             
             to_call = game.current_bet - player.total_bet_this_round
@@ -452,7 +744,7 @@ class PokerUI:
                 # Check if should skip
                 if self.skip_to_player:
                     # Skip all AI until player's turn
-                    current_player_idx = (current_player_idx + 1) % len(game.players)
+                    state["current_player_idx"] = (state["current_player_idx"] + 1) % len(game.players)
                     continue
                 
                 if to_call == 0:
@@ -462,82 +754,42 @@ class PokerUI:
                 
                 # Add delay so user can see action
                 if not self.skip_next_ai_action:
-                    delay_val = float(self.game_delay_var.get())
-                    time.sleep(delay_val)
+                    delay_ms = self._ai_delay_ms()
                 else:
                     self.skip_next_ai_action = False
-            else:
-                # Human player - wait for action
-                self.current_player_action = None
-                self.player_action_info = {
-                    "to_call": to_call,
-                    "stack": player.stack,
-                    "pot": game.pot
-                }
-                
-                # Calculate win probability if enabled
-                if self.show_equity_game.get():
-                    try:
-                        # Get count of active opponents
-                        active_opponents = len(game.get_active_opponents(player))
-                        result = self.win_probability_calculator.calculate_win_probability(
-                            player.hole_cards,
-                            game.community_cards,
-                            active_opponents
-                        )
-                        self.player_action_info["win_prob"] = result['win_prob']
-                        self.player_action_info["equity"] = result['equity']
-                    except Exception as e:
-                        print(f"Error calculating win probability: {e}")
-                
-                # Clear skip flags and disable skip buttons - it's player's turn now
-                self.skip_to_player = False
-                self.next_action_button.config(state=tk.DISABLED)
-                self.next_player_button.config(state=tk.DISABLED)
-                
-                # Disable action buttons after AI actions complete
-                self.disable_action_buttons()
-                
-                self.update_action_buttons(to_call)
-                self.setup_raise_controls(to_call, player.stack)
-                self.update_display(f"{stage} - Waiting for your action")
-                
-                # Wait for player action
-                while self.current_player_action is None and self.game_running:
-                    self.root.update()
-                
-                if not self.game_running:
-                    return
-                
-                action = self.current_player_action
-            
-            self.process_action(player, action, stage)
+                    delay_ms = 0
+                self.root.after(delay_ms, self._advance_betting, action)
+                return
             
-            # Disable buttons after action is submitted
-            if not player.is_ai:
-                self.disable_action_buttons()
+            # Human player - wait for action
+            self.player_action_info = {
+                "to_call": to_call,
+                "stack": player.stack,
+                "pot": game.pot
+            }
             
-            players_who_acted_this_level.add(player.player_id)
+            # Calculate win probability if enabled
+            if self.show_equity_game.get():
+                # Get count of active opponents
+                active_opponents = len(game.get_active_opponents(player))
+                self.request_equity(player, active_opponents)
             
-            # Check if betting round is complete
-            active_players = game.get_active_players()
-            if len(active_players) <= 1:
-                break
+            # Clear skip flags and disable skip buttons - it's player's turn now
+            self.skip_to_player = False
+            self.next_action_button.config(state=tk.DISABLED)
+            self.next_player_button.config(state=tk.DISABLED)
             
-            active_unfolded = game.get_unfolded_players()
-            if len(active_unfolded) <= 1:
-                break
+            # Disable action buttons after AI actions complete
+            self.disable_action_buttons()
             
-            if all(p.player_id in players_who_acted_this_level for p in active_unfolded):
-                all_matched = all(
-                    p.total_bet_this_round == game.current_bet
-                    for p in active_unfolded
-                )
-                if all_matched:
-                    break
+            self.update_action_buttons(to_call)
+            self.setup_raise_controls(to_call, player.stack)
+            self.update_display(f"{stage} - Waiting for your action")
             
-            current_player_idx = (current_player_idx + 1) % len(game.players)
-            self.update_display(stage)
+            # The action buttons resume the round through player_action/confirm_raise
+            self.update_history_display()
+            state["awaiting_player"] = True
+            return
     
     def process_action(self, player, action, stage):
         """Process a player's action"""
@@ -548,7 +800,7 @@ class PokerUI:
             player.is_folded = True
             msg = f"Player {player.player_id} folds"
             self.log_event(msg)
-            self.message_label.config(text=msg)
+            self.message_var.set(msg)
         elif action == "call":
             if to_call > 0:
                 bet_amount = min(to_call, player.stack)
@@ -557,7 +809,7 @@ class PokerUI:
                 game.pot += bet_amount
                 msg = f"Player {player.player_id} calls ${bet_amount}"
                 self.log_event(msg)
-                self.message_label.config(text=msg)
+                self.message_var.set(msg)
                 game.current_bet = max(game.current_bet, player.total_bet_this_round)
         elif action == "raise":
             raise_amount = self.raise_amount if isinstance(self.raise_amount, int) else game.big_blind
@@ -568,26 +820,31 @@ class PokerUI:
             game.current_bet = player.total_bet_this_round
             msg = f"Player {player.player_id} raises to ${player.total_bet_this_round}"
             self.log_event(msg)
-            self.message_label.config(text=msg)
+            self.message_var.set(msg)
         elif action == "check":
             if to_call == 0:
                 msg = f"Player {player.player_id} checks"
                 self.log_event(msg)
-                self.message_label.config(text=msg)
-        
-        # Update history display after every action
-        self.update_history_display()
+                self.message_var.set(msg)
     
     def player_action(self, action):
         """Handle player action button press"""
-        if action in ["check", "call", "fold"]:
-            self.current_player_action = action
-        self.update_display("Executing action...")
+        if action in ["check", "call", "fold"] and self._take_player_turn():
+            self.update_display("Executing action...")
+            self._advance_betting(action)
+    
+    def _take_player_turn(self) -> bool:
+        """Claim the pending human turn so a button press is applied at most once"""
+        state = self.betting_state
+        if state is None or not state["awaiting_player"]:
+            return False
+        state["awaiting_player"] = False
+        return True
     
     def skip_next_action(self):
         """Skip the next AI action"""
         self.skip_next_ai_action = True
-        self.message_label.config(text="Skipping next AI action...")
+        self.message_var.set("Skipping next AI action...")
         # Disable skip buttons until next AI turn
         self.next_action_button.config(state=tk.DISABLED)
         self.next_player_button.config(state=tk.DISABLED)
@@ -595,7 +852,7 @@ class PokerUI:
     def skip_to_player_action(self):
         """Skip all AI actions until player's turn"""
         self.skip_to_player = True
-        self.message_label.config(text="Skipping to your turn...")
+        self.message_var.set("Skipping to your turn...")
         # Disable skip buttons until next AI turn
         self.next_action_button.config(state=tk.DISABLED)
         self.next_player_button.config(state=tk.DISABLED)
@@ -628,37 +885,31 @@ class PokerUI:
         try:
             delay_val = float(self.game_delay_var.get())
             if 0.0 <= delay_val <= 5.0:
-                self.message_label.config(text=f"AI delay set to {delay_val}s")
+                self.message_var.set(f"AI delay set to {delay_val}s")
                 print(f"[INFO] AI delay updated to {delay_val}s")
             else:
                 self.game_delay_var.set("0.1")
-                self.message_label.config(text="Invalid delay value. Set to 0.1s")
+                self.message_var.set("Invalid delay value. Set to 0.1s")
         except ValueError:
             self.game_delay_var.set("0.1")
-            self.message_label.config(text="Invalid delay value. Set to 0.1s")
+            self.message_var.set("Invalid delay value. Set to 0.1s")
     
     def _on_equity_toggle(self, *args):
         """Called when equity toggle is changed, updates display immediately"""
         # If toggling ON and player action info exists, calculate equity if not already done
         if self.show_equity_game.get() and hasattr(self, 'player_action_info'):
-            if "equity" not in self.player_action_info:
+            if "equity" not in self.player_action_info and self._pending_equity_future is None:
                 game = self._assert_game()
                 player = game.players[0]  # Human player is always player 0
-                try:
-                    result = self.win_probability_calculator.calculate_win_probability(
-                        player.hole_cards,
-                        game.community_cards,
-                        len([p for p in game.players if not p.is_folded and p != player])
-                    )
-                    self.player_action_info["win_prob"] = result['win_prob']
-                    self.player_action_info["equity"] = result['equity']
-                except Exception as e:
-                    print(f"Error calculating win probability: {e}")
+                self.request_equity(
+                    player,
+                    len([p for p in game.players if not p.is_folded and p != player])
+                )
         self.update_display("Equity toggled")
     
     def update_raise_label(self, value):
         """Update raise label when slider changes"""
-        self.raise_amount_label.config(text=f"${int(float(value))}")
+        self.raise_amount_var.set(f"${int(float(value))}")
         self.raise_entry.delete(0, tk.END)
         self.raise_entry.insert(0, str(int(float(value))))
     
@@ -667,7 +918,7 @@ class PokerUI:
         try:
             val = int(self.raise_entry.get())
             self.raise_var.set(val)
-            self.raise_amount_label.config(text=f"${val}")
+            self.raise_amount_var.set(f"${val}")
         except ValueError:
             pass
     
@@ -675,8 +926,9 @@ class PokerUI:
         """Confirm raise amount"""
         try:
             amount = int(self.raise_entry.get())
-            self.current_player_action = "raise"
-            self.raise_amount = amount
+            if self._take_player_turn():
+                self.raise_amount = amount
+                self._advance_betting("raise")
         except ValueError:
             messagebox.showerror("Error", "Invalid raise amount")
     
@@ -695,11 +947,19 @@ class PokerUI:
         self.raise_var.set(min_raise)
         self.raise_entry.delete(0, tk.END)
         self.raise_entry.insert(0, str(min_raise))
-        self.raise_amount_label.config(text=f"${min_raise}")
+        self.raise_amount_var.set(f"${min_raise}")
     
     def update_display(self, stage=""):
-        """Update the game display"""
-        self.root.after(0, self._update_display, stage)
+        """Schedule a redraw of the game display; calls before it runs share one redraw with the latest stage"""
+        self._display_stage = stage
+        if not self._display_dirty:
+            self._display_dirty = True
+            self.root.after_idle(self._flush_display)
+    
+    def _flush_display(self):
+        """Run the redraw scheduled by update_display"""
+        self._display_dirty = False
+        self._update_display(self._display_stage)
     
     def _update_display(self, stage):
         """Actually update the display"""
@@ -711,38 +971,27 @@ class PokerUI:
             return
         
         # Update title
-        self.title_label.config(text=f"Hand #{game.hand_number} - {stage}")
+        self.title_var.set(f"Hand #{game.hand_number} - {stage}")
         
         # Update community cards with images only if changed
         if game.community_cards != self.community_cards_cached:
             self.community_cards_cached = list(game.community_cards)
-            for widget in self.community_cards_frame.winfo_children():
-                widget.destroy()
+            self._show_cards(self.community_card_labels, game.community_cards)
             if game.community_cards:
-                cards_str = ", ".join(str(card) for card in game.community_cards)
-                self.community_label.config(text=cards_str)
-                # Create a sub-frame to center the cards
-                cards_container = tk.Frame(self.community_cards_frame, bg="#2d5016")
-                cards_container.pack(expand=True)
-                for card in game.community_cards:
-                    card_name = self.card_to_filename(card)
-                    photo = self.get_card_photo(card_name)
-                    if photo:
-                        label = tk.Label(cards_container, image=photo, bg="#2d5016")
-                        label.image = photo  # type: ignore[attr-defined]
-                        label.pack(side=tk.LEFT, padx=5)
+                cards_str = _cards_str(tuple(game.community_cards))
+                self.community_var.set(cards_str)
             else:
-                self.community_label.config(text="No community cards yet")
+                self.community_var.set("No community cards yet")
         
         # Update pot
-        self.pot_label.config(text=f"Pot: ${game.pot}")
+        self.pot_var.set(f"Pot: ${game.pot}")
         
         # Update players info
         players_info = "Player | Cards | Stack | Bet\n" + "-" * 40 + "\n"
         for i, player in enumerate(game.players):
             status = " (YOU)" if i == 0 else " (AI)"
             folded = " (FOLDED)" if player.is_folded else ""
-            cards = f"{player.hole_cards}" if i == 0 else "Hidden"
+            cards = f"[{_cards_str(tuple(player.hole_cards))}]" if i == 0 else "Hidden"
             players_info += f"{i}{status}{folded} | {cards} | ${player.stack} | ${player.total_bet_this_round}\n"
         
         self.players_text.config(state=tk.NORMAL)
@@ -754,20 +1003,12 @@ class PokerUI:
         player = game.players[0]
         if player.hole_cards != self.hand_cards_cached:
             self.hand_cards_cached = list(player.hole_cards) if player.hole_cards else []
-            for widget in self.your_hand_cards_frame.winfo_children():
-                widget.destroy()
+            self._show_cards(self.hand_card_labels, self.hand_cards_cached)
             if player.hole_cards:
-                cards_str = ", ".join(str(card) for card in player.hole_cards)
-                self.your_hand_label.config(text=f"{cards_str} | Stack: ${player.stack}")
-                for card in player.hole_cards:
-                    card_name = self.card_to_filename(card)
-                    photo = self.get_card_photo(card_name)
-                    if photo:
-                        label = tk.Label(self.your_hand_cards_frame, image=photo, bg="#2d5016")
-                        label.image = photo  # type: ignore[attr-defined]
-                        label.pack(side=tk.LEFT, padx=10)
+                cards_str = _cards_str(tuple(player.hole_cards))
+                self.your_hand_var.set(f"{cards_str} | Stack: ${player.stack}")
             else:
-                self.your_hand_label.config(text=f"Stack: ${player.stack}")
+                self.your_hand_var.set(f"Stack: ${player.stack}")
         
         # Update action info
         if hasattr(self, 'player_action_info'):
@@ -779,8 +1020,10 @@ class PokerUI:
                 equity = self.player_action_info["equity"]
                 win_prob = self.player_action_info["win_prob"]
                 action_text += f" | Equity: {equity:.1%} (Win: {win_prob:.1%})"
+            elif self.show_equity_game.get() and self._pending_equity_future is not None:
+                action_text += " | Equity: calculating..."
             
-            self.action_info_label.config(text=action_text)
+            self.action_info_var.set(action_text)
     
     def _reveal_all_hands(self):
         """Reveal all player hands and best 5-card hands at showdown"""
@@ -789,7 +1032,7 @@ class PokerUI:
         for i, player in enumerate(game.players):
             status = " (YOU)" if i == 0 else " (AI)"
             if not player.is_folded:
-                hole_cards_str = ", ".join(str(card) for card in player.hole_cards)
+                hole_cards_str = _cards_str(tuple(player.hole_cards))
                 self.log_event(f"Player {i}{status}: {hole_cards_str}")
                 
                 # Show best 5-card hand
@@ -797,7 +1040,7 @@ class PokerUI:
                 if best_hand:
                     hand_type = best_hand[0]
                     best_five = best_hand[1]
-                    best_five_str = ", ".join(str(card) for card in best_five)
+                    best_five_str = _cards_str(tuple(best_five))
                     self.log_event(f"  Best Hand: {hand_type} - {best_five_str}")
             else:
                 self.log_event(f"Player {i}{status}: FOLDED")
@@ -831,17 +1074,18 @@ class PokerUI:
         return str(card) + ".png"
     
     def log_event(self, message):
-        """Log an event to the game history"""
-        self.game_history.append(message)
+        """Log an event to the game history (shown at the next update_history_display)"""
+        self._pending_log.append(message)
     
     def update_history_display(self):
-        """Update the game history display"""
+        """Append the pending history lines to the game history display in one insert"""
+        if not self._pending_log:
+            return
         self.history_text.config(state=tk.NORMAL)
-        self.history_text.delete(1.0, tk.END)
-        for event in self.game_history:
-            self.history_text.insert(tk.END, event + "\n")
+        self.history_text.insert(tk.END, "\n".join(self._pending_log) + "\n")
         self.history_text.see(tk.END)  # Scroll to bottom
         self.history_text.config(state=tk.DISABLED)
+        self._pending_log.clear()
 
 
 if __name__ == "__main__":
@@ -2,8 +2,9 @@
 Test script demonstrating the poker bot AI system
 """
 
-from poker_game import PokerGame, Card
-from poker_bot import PokerBot
+from poker_game import PokerGame, Card, POSITIONS
+from poker_bot import PokerBot, BotManager, _POS_MULT, _build_decide_fn, _preflop_formula
+from win_probability import WinProbabilityCalculator
 
 def test_bot_types():
     """Display and test different bot types"""
@@ -47,16 +48,14 @@ def test_position_multiplier():
     print("\n\n3. Position Multipliers:")
     print("-" * 70)
     
-    bot = PokerBot(0, "TAG")
-    
-    positions = [
-        ("early", "Early Position (UTG, UTG+1)"),
-        ("middle", "Middle Position (MP, MP+1)"),
-        ("late", "Late Position (CO, Button)"),
+    descriptions = [
+        "Early Position (UTG, UTG+1)",
+        "Middle Position (MP, MP+1)",
+        "Late Position (CO, Button)",
     ]
     
-    for pos, desc in positions:
-        mult = bot._get_position_multiplier(pos)
+    for position_idx, desc in enumerate(descriptions):
+        mult = _POS_MULT[position_idx]
         print(f"{desc:30} -> {mult:.2f}x multiplier")
 
 
@@ -97,7 +96,7 @@ def test_bot_decision():
         to_call=50,
         player_stack=1000,
         pot=300,
-        position="late",
+        position_idx=2,  # late
         num_opponents=2,
         small_blind=5,
         big_blind=10
@@ -123,13 +122,11 @@ def test_different_positions():
     hole_cards = [Card("Spades", "7"), Card("Hearts", "6")]
     community = []
     
-    positions = ["early", "middle", "late"]
-    
     print("Test: 76o (seven-six offsuit) pre-flop vs 50 bet with 1000 stack")
     
-    for pos in positions:
+    for position_idx, pos in enumerate(POSITIONS):
         strength = bot_tag._preflop_hand_strength(hole_cards)
-        multiplier = bot_tag._get_position_multiplier(pos)
+        multiplier = _POS_MULT[position_idx]
         adjusted = strength * multiplier
         
         print(f"\n{pos.upper():8} - Hand strength: {strength:.2f}, Multiplier: {multiplier:.2f}x")
@@ -141,6 +138,149 @@ def test_different_positions():
         print(f"         Decision: {'FOLD' if adjusted < fold_threshold else 'CONSIDER'}")
 
 
+def test_preflop_strength_thresholds():
+    """Test that the pre-flop strength table makes the same decisions as the exact formula"""
+    print("\n\n7. Pre-flop Strengths at Decision Thresholds:")
+    print("-" * 70)
+    
+    bot = PokerBot(0, "TAG")
+    bot._next_rand = lambda: 0.0  # Always take the aggressive branch
+    facing_bet = _build_decide_fn(
+        fold_bias_q7=0, aggression=1.0, next_rand=lambda: 0.0,
+        decide_check_or_bet=bot._decide_check_or_bet, calculate_raise_amount=bot._calculate_raise_amount
+    )
+    
+    bet_mismatches = []
+    raise_mismatches = []
+    all_in_mismatches = []
+    for rank1 in Card.RANKS:
+        for rank2 in Card.RANKS:
+            for suited in (False, True):
+                if suited and rank1 == rank2:
+                    continue
+                hole = [Card("Spades", rank1), Card("Spades" if suited else "Hearts", rank2)]
+                exact = _preflop_formula(hole[0].rank_int, hole[1].rank_int, suited)
+                strength = bot._preflop_hand_strength(hole)
+                name = f"{rank1}{rank2}{'s' if suited else 'o'}"
+                
+                # Free to check: bet on hand strength alone (equity 0)
+                action, _ = bot._decide_check_or_bet(
+                    equity=0.0, hand_strength=strength, num_opponents=3, player_stack=1000, current_bet=0
+                )
+                if action != ("raise" if exact > 0.65 else "check"):
+                    bet_mismatches.append(name)
+                
+                # Facing a bet with a calling equity: raise on hand strength
+                action, _ = facing_bet(
+                    to_call=10, player_stack=1000, equity=0.9, hand_strength=strength, pot_odds=0.1,
+                    stack_depth=100.0, position_multiplier=1.0, num_opponents=1, is_preflop=True, current_bet=10
+                )
+                if action != ("raise" if exact > 0.4 else "call"):
+                    raise_mismatches.append(name)
+                
+                # Forced all-in estimate (see PokerBot._decide_with_limited_equity)
+                for num_opponents in range(1, 10):
+                    estimate, expected = strength ** num_opponents, exact ** num_opponents
+                    if (estimate > 0.40, 0.35 < estimate < 0.45) != (expected > 0.40, 0.35 < expected < 0.45):
+                        all_in_mismatches.append(f"{name} vs {num_opponents}")
+    
+    print(f"Check-or-bet mismatches:   {bet_mismatches or 'none'}")
+    print(f"Raise-or-call mismatches:  {raise_mismatches or 'none'}")
+    print(f"Forced all-in mismatches:  {all_in_mismatches or 'none'}")
+    assert not bet_mismatches, f"Check-or-bet decisions differ from the exact strengths: {bet_mismatches}"
+    assert not raise_mismatches, f"Raise-or-call decisions differ from the exact strengths: {raise_mismatches}"
+    assert not all_in_mismatches, f"Forced all-in estimates differ from the exact strengths: {all_in_mismatches}"
+
+
+def test_equity_cache_thresholds():
+    """Test that a cached early-exit equity is only reused for the thresholds it was tested against"""
+    print("\n\n8. Equity Cache and Early-Exit Thresholds:")
+    print("-" * 70)
+    
+    bot = PokerBot(0, "TAG")
+    bot.win_prob_calc = WinProbabilityCalculator(num_simulations=1000, seed=1)
+    aces = [Card("Spades", "A"), Card("Hearts", "A")]
+    
+    # The one cache entry is (equity, run-outs simulated, thresholds)
+    bot._get_equity(aces, [], 1, [bot.BET_EQUITY])
+    (entry,) = bot._equity_cache.values()
+    print(f"AA vs a {bot.BET_EQUITY} bet threshold: {entry[0]:.2f} equity after {entry[1]} run-outs")
+    assert entry[1] < 1000, "AA vs the bet threshold should stop early"
+    bot._get_equity(aces, [], 1, [bot.BET_EQUITY])
+    assert next(iter(bot._equity_cache.values())) is entry, "Same thresholds should reuse the early-exit estimate"
+    bot._get_equity(aces, [], 1, [0.3, 0.1, 0.5])
+    (entry,) = bot._equity_cache.values()
+    print(f"Facing a bet (thresholds {entry[2]}): re-simulated, {entry[1]} run-outs")
+    assert entry[2] == (0.3, 0.1, 0.5), "New thresholds should re-simulate an early-exit estimate"
+    
+    bot.reset_hand()
+    bot._get_equity(aces, [], 1)
+    bot._get_equity(aces, [], 1, [bot.BET_EQUITY])
+    bot._get_equity(aces, [], 1, [0.3, 0.1, 0.5])
+    (entry,) = bot._equity_cache.values()
+    print(f"Full run: {entry[1]} run-outs, reused for any thresholds")
+    assert entry[1:] == (1000, None), "A full-length run should be reused for any thresholds"
+
+
+def test_decide_all_matches_decide_action():
+    """Test that BotManager.decide_all decides exactly as decide_action does bot by bot"""
+    print("\n\n9. Batched Decisions vs Per-Bot Decisions:")
+    print("-" * 70)
+    
+    hole_cards = {
+        0: [Card("Spades", "A"), Card("Spades", "K")],
+        1: [Card("Hearts", "7"), Card("Clubs", "2")],
+        2: [Card("Diamonds", "Q"), Card("Clubs", "Q")],
+        3: [Card("Spades", "9"), Card("Spades", "8")],
+        4: [Card("Diamonds", "5"), Card("Hearts", "3")],
+    }
+    position_idx = {0: 0, 1: 0, 2: 1, 3: 2, 4: 2}
+    flop = [Card("Hearts", "K"), Card("Diamonds", "8"), Card("Spades", "2")]
+    # (name, community cards, current bet, to_call, stacks, pot)
+    scenarios = [
+        ("Pre-flop, facing a raise", [], 60, {0: 60, 1: 60, 2: 50, 3: 40, 4: 60},
+         {0: 1000, 1: 1000, 2: 1000, 3: 1000, 4: 1000}, 90),
+        ("Flop, checked to", flop, 0, {0: 0, 1: 0, 2: 0, 3: 0, 4: 0},
+         {0: 940, 1: 940, 2: 940, 3: 940, 4: 940}, 300),
+        ("Flop, facing a bet", flop, 150, {0: 150, 1: 150, 2: 150, 3: 150, 4: 150},
+         {0: 940, 1: 940, 2: 940, 3: 940, 4: 940}, 450),
+        ("Flop, short stacks", flop, 400, {0: 400, 1: 400, 2: 400, 3: 400, 4: 400},
+         {0: 120, 1: 1000, 2: 300, 3: 1000, 4: 50}, 700),
+    ]
+    
+    for name, community, current_bet, to_call, stacks, pot in scenarios:
+        batched = BotManager(5, seed=11)
+        single = BotManager(5, seed=11)
+        decisions = batched.decide_all(
+            hole_cards=hole_cards,
+            community_cards=community,
+            current_bet=current_bet,
+            to_call=to_call,
+            player_stacks=stacks,
+            pot=pot,
+            position_idx=position_idx,
+            small_blind=10,
+            big_blind=20
+        )
+        expected = {
+            player_id: single.get_bot(player_id).decide_action(
+                hole_cards=cards,
+                community_cards=community,
+                current_bet=current_bet,
+                to_call=to_call[player_id],
+                player_stack=stacks[player_id],
+                pot=pot,
+                position_idx=position_idx[player_id],
+                num_opponents=len(hole_cards) - 1,
+                small_blind=10,
+                big_blind=20
+            )
+            for player_id, cards in hole_cards.items()
+        }
+        print(f"{name:<26} {decisions}")
+        assert decisions == expected, f"{name}: decide_all gave {decisions}, decide_action gave {expected}"
+
+
 if __name__ == "__main__":
     test_bot_types()
     test_preflop_decisions()
@@ -148,6 +288,9 @@ if __name__ == "__main__":
     test_game_with_bots()
     test_bot_decision()
     test_different_positions()
+    test_preflop_strength_thresholds()
+    test_equity_cache_thresholds()
+    test_decide_all_matches_decide_action()
     
     print("\n\n" + "=" * 70)
     print("TEST COMPLETE")
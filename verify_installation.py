@@ -68,7 +68,7 @@ def check_bot_decision():
             to_call=10,
             player_stack=1000,
             pot=20,
-            position="late",
+            position_idx=2,  # late
             num_opponents=2,
             small_blind=5,
             big_blind=10
@@ -113,6 +113,7 @@ def check_files():
     
     required = [
         "poker_game.py",
+        "hand_eval.py",
         "poker_bot.py",
         "win_probability.py",
         "poker_ui.py",
@@ -1,25 +1,35 @@
+import concurrent.futures
+import math
+import operator
 import random
 from typing import List, Tuple, Dict, Optional
-from poker_game import Card, Deck, HandEvaluator
+from poker_game import Card, HandEvaluator, CK_DECK, evaluate_texas_cards
+from config import NUM_SIMULATIONS_SETUP_SCREEN
 
 
 class WinProbabilityCalculator:
     """Calculate win probability for a given poker situation"""
     
-    def __init__(self, num_simulations: int = 10000):
+    # Run-outs between early-exit checks when thresholds are given
+    EARLY_EXIT_INTERVAL = 64
+    
+    def __init__(self, num_simulations: int = NUM_SIMULATIONS_SETUP_SCREEN, seed: Optional[int] = None):
         """
         Initialize calculator
         
         Args:
             num_simulations: Number of Monte Carlo simulations to run
+            seed: Seed for the run-out draws (None for an unseeded stream)
         """
         self.num_simulations = num_simulations
+        self._rng = random.Random(seed)
     
     def calculate_win_probability(
         self,
         player_hole_cards: List[Card],
         community_cards: List[Card],
-        num_opponents: int
+        num_opponents: int,
+        thresholds: Optional[List[float]] = None
     ) -> Dict[str, float]:
         """
         Calculate win probability for a player
@@ -28,6 +38,11 @@ class WinProbabilityCalculator:
             player_hole_cards: Player's 2 hole cards
             community_cards: Community cards (0, 3, 4, or 5 cards)
             num_opponents: Number of opponents still in the hand
+            thresholds: Equity levels the caller will compare against. If
+                given, simulation stops early (checked every
+                EARLY_EXIT_INTERVAL run-outs) once the 95% confidence
+                interval of the equity lies on one side of every threshold;
+                num_simulations becomes the ceiling.
         
         Returns:
             Dictionary with:
@@ -51,32 +66,96 @@ class WinProbabilityCalculator:
         if all_player_cards & all_community_cards:
             raise ValueError("Player cards and community cards have duplicates")
         
-        # Run simulations
-        wins = 0
-        ties = 0
-        losses = 0
+        return self.calculate_win_probability_ck(
+            [c.ck_int for c in player_hole_cards],
+            [c.ck_int for c in community_cards],
+            num_opponents,
+            thresholds
+        )
+    
+    def calculate_win_probability_ck(
+        self,
+        hero: List[int],
+        board: List[int],
+        num_opponents: int,
+        thresholds: Optional[List[float]] = None
+    ) -> Dict[str, float]:
+        """
+        calculate_win_probability on Cactus-Kev card ints (Card.ck_int), without validation
         
-        for _ in range(self.num_simulations):
-            result = self._simulate_game(
-                player_hole_cards,
-                community_cards,
-                num_opponents
+        The fast path for callers that already hold distinct, well-formed cards
+        as ints; arguments and result are as for calculate_win_probability.
+        """
+        # The unseen deck is the same for every run-out
+        known = set(hero + board)
+        deck = [c for c in CK_DECK if c not in known]
+        
+        # Run simulations
+        num_players = num_opponents + 1
+        if thresholds:
+            wins = ties = losses = 0
+            total = 0
+            while total < self.num_simulations:
+                batch = min(self.EARLY_EXIT_INTERVAL, self.num_simulations - total)
+                batch_wins, batch_ties, batch_losses = self._simulate_batch(
+                    hero, board, deck, num_opponents, batch
+                )
+                wins += batch_wins
+                ties += batch_ties
+                losses += batch_losses
+                total += batch
+                
+                # Stop once no threshold falls inside the 95% confidence interval
+                p = (wins + ties / num_players) / total
+                margin = 1.96 * math.sqrt(p * (1 - p) / total)
+                if all(t < p - margin or t > p + margin for t in thresholds):
+                    break
+        else:
+            wins, ties, losses = self._simulate_batch(
+                hero, board, deck, num_opponents, self.num_simulations
             )
-            
-            if result == "win":
-                wins += 1
-            elif result == "tie":
-                ties += 1
-            else:
-                losses += 1
+            total = self.num_simulations
         
-        total = self.num_simulations
+        return self._summarize(wins, ties, losses, num_players)
+    
+    def calculate_win_probability_parallel(
+        self,
+        hero: List[int],
+        board: List[int],
+        num_opponents: int,
+        executor: concurrent.futures.Executor,
+        num_shards: int
+    ) -> Dict[str, float]:
+        """
+        calculate_win_probability_ck with the run-outs split across an executor
+        
+        The num_simulations run-outs are cut into num_shards simulate_runouts
+        jobs, each seeded from this calculator's RNG (so a seeded calculator
+        still repeats), and their counts are summed. Pass a ProcessPoolExecutor
+        to use several cores.
+        """
+        base, extra = divmod(self.num_simulations, num_shards)
+        futures = [
+            executor.submit(simulate_runouts, hero, board, num_opponents, base + (i < extra), self._rng.getrandbits(64))
+            for i in range(num_shards) if base + (i < extra)
+        ]
+        wins = ties = losses = 0
+        for future in concurrent.futures.as_completed(futures):
+            shard_wins, shard_ties, shard_losses = future.result()
+            wins += shard_wins
+            ties += shard_ties
+            losses += shard_losses
+        return self._summarize(wins, ties, losses, num_opponents + 1)
+    
+    @staticmethod
+    def _summarize(wins: int, ties: int, losses: int, num_players: int) -> Dict[str, float]:
+        """Result dictionary (see calculate_win_probability) from run-out counts"""
+        total = wins + ties + losses
         win_prob = wins / total
         tie_prob = ties / total
         lose_prob = losses / total
         
         # Equity = win_prob + (tie_prob / num_players)
-        num_players = num_opponents + 1
         equity = win_prob + (tie_prob / num_players)
         
         return {
@@ -89,68 +168,60 @@ class WinProbabilityCalculator:
             'losses': losses
         }
     
-    def _simulate_game(
+    def _simulate_batch(
         self,
-        player_hole_cards: List[Card],
-        community_cards: List[Card],
-        num_opponents: int
-    ) -> str:
+        hero: List[int],
+        board: List[int],
+        deck: List[int],
+        num_opponents: int,
+        num_runouts: int
+    ) -> Tuple[int, int, int]:
         """
-        Simulate a single game and return result
+        Simulate a batch of games and count the results
+        
+        All run-outs are drawn up front, then ranked one column (hero, or
+        one opponent seat) at a time with map() rather than one game at a time.
+        
+        Args:
+            hero: Player's hole cards as Card.ck_int values
+            board: Known community cards as Card.ck_int values
+            deck: Unseen cards as Card.ck_int values (not modified)
+            num_opponents: Number of opponents to deal in
+            num_runouts: Number of games to simulate
         
         Returns:
-            "win", "tie", or "loss"
+            (wins, ties, losses)
         """
-        # Create a fresh deck excluding known cards
-        deck = self._create_remaining_deck(player_hole_cards, community_cards)
-        
-        # Generate opponent hole cards
-        opponent_cards = []
-        for _ in range(num_opponents):
-            opp_hole = [deck.pop(), deck.pop()]
-            opponent_cards.append(opp_hole)
-        
-        # Complete the community cards if needed
-        remaining_community = self._complete_community_cards(community_cards, deck)
-        
-        # Evaluate all hands
-        player_hand = HandEvaluator.find_best_hand(player_hole_cards, remaining_community)
-        player_rank = HandEvaluator.HAND_RANKS[player_hand[0]]
-        player_info = HandEvaluator.evaluate_hand(player_hand[1])
-        player_tiebreaker = player_info[1]
-        
-        # Check opponent hands
-        best_opponent_rank = 0
-        best_opponent_tiebreaker = None
-        opponents_with_best = 0
-        
-        for opp_hole in opponent_cards:
-            opp_hand = HandEvaluator.find_best_hand(opp_hole, remaining_community)
-            opp_rank = HandEvaluator.HAND_RANKS[opp_hand[0]]
-            opp_info = HandEvaluator.evaluate_hand(opp_hand[1])
-            opp_tiebreaker = opp_info[1]
-            
-            # Compare with current best
-            if opp_rank > best_opponent_rank:
-                best_opponent_rank = opp_rank
-                best_opponent_tiebreaker = opp_tiebreaker
-                opponents_with_best = 1
-            elif opp_rank == best_opponent_rank and opp_tiebreaker == best_opponent_tiebreaker:
-                opponents_with_best += 1
-        
-        # Determine result
-        if player_rank > best_opponent_rank:
-            return "win"
-        elif player_rank == best_opponent_rank:
-            if player_tiebreaker > best_opponent_tiebreaker:
-                return "win"
-            elif player_tiebreaker == best_opponent_tiebreaker:
-                # Tie with at least one opponent
-                return "tie"
-            else:
-                return "loss"
-        else:
-            return "loss"
+        # Each run-out: opponent hole cards first, then the rest of the board
+        num_hole = 2 * num_opponents
+        num_drawn = num_hole + 5 - len(board)
+        runouts: List[List[int]] = [[]] * num_runouts  # every slot is replaced below
+        
+        # Partial Fisher-Yates in one reusable buffer: the first num_drawn
+        # slots become a uniform draw without replacement. The buffer never
+        # needs resetting since any permutation of the deck is a valid start.
+        # Each slot's span of still-undrawn cards is the same in every run-out.
+        buf = list(deck)
+        num_cards = len(buf)
+        spans = tuple((i, num_cards - i) for i in range(num_drawn))
+        rand = self._rng.random
+        for r in range(num_runouts):
+            for i, span in spans:
+                j = i + int(rand() * span)
+                buf[i], buf[j] = buf[j], buf[i]
+            runouts[r] = buf[:num_drawn]
+        boards = [board + drawn[num_hole:] for drawn in runouts]
+        
+        # Cactus-Kev ranks: lower is better
+        player_ranks = list(map(evaluate_texas_cards, [hero + b for b in boards]))
+        best_opponent_ranks = [7463] * num_runouts  # worse than any hand (7462 is the worst)
+        for i in range(0, num_hole, 2):
+            seat_ranks = map(evaluate_texas_cards, [drawn[i:i + 2] + b for drawn, b in zip(runouts, boards)])
+            best_opponent_ranks = list(map(min, best_opponent_ranks, seat_ranks))
+        
+        wins = sum(map(operator.lt, player_ranks, best_opponent_ranks))
+        ties = sum(map(operator.eq, player_ranks, best_opponent_ranks))
+        return wins, ties, num_runouts - wins - ties
     
     def _create_remaining_deck(
         self,
@@ -176,7 +247,7 @@ class WinProbabilityCalculator:
                 if str(card) not in known_cards:
                     remaining.append(card)
         
-        random.shuffle(remaining)
+        self._rng.shuffle(remaining)
         return remaining
     
     def _complete_community_cards(
@@ -265,20 +336,18 @@ class WinProbabilityCalculator:
             remaining_community = self._complete_community_cards(community_cards, deck)
             
             # Evaluate player hand
-            player_hand = HandEvaluator.find_best_hand(player_hole_cards, remaining_community)
-            player_rank = HandEvaluator.HAND_RANKS[player_hand[0]]
-            player_info = HandEvaluator.evaluate_hand(player_hand[1])
-            player_tiebreaker = player_info[1]
+            player_hand = HandEvaluator.find_best_hand_with_rank(player_hole_cards, remaining_community)
+            player_rank = player_hand[1]
+            player_tiebreaker = player_hand[3]
             
             # Evaluate opponent hands
             best_opponent_rank = 0
             best_opponent_tiebreaker = None
             
             for opp_hole in opponent_hands:
-                opp_hand = HandEvaluator.find_best_hand(opp_hole, remaining_community)
-                opp_rank = HandEvaluator.HAND_RANKS[opp_hand[0]]
-                opp_info = HandEvaluator.evaluate_hand(opp_hand[1])
-                opp_tiebreaker = opp_info[1]
+                opp_best = HandEvaluator.find_best_hand_with_rank(opp_hole, remaining_community)
+                opp_rank = opp_best[1]
+                opp_tiebreaker = opp_best[3]
                 
                 if opp_rank > best_opponent_rank:
                     best_opponent_rank = opp_rank
@@ -318,6 +387,26 @@ class WinProbabilityCalculator:
         }
 
 
+def simulate_runouts(
+    hero: List[int],
+    board: List[int],
+    num_opponents: int,
+    num_runouts: int,
+    seed: int
+) -> Tuple[int, int, int]:
+    """
+    (wins, ties, losses) over num_runouts run-outs drawn with the given seed
+
+    Module-level so process pools can pickle it (see
+    WinProbabilityCalculator.calculate_win_probability_parallel).
+    """
+    known = set(hero + board)
+    deck = [c for c in CK_DECK if c not in known]
+    return WinProbabilityCalculator(num_runouts, seed)._simulate_batch(
+        hero, board, deck, num_opponents, num_runouts
+    )
+
+
 # Example usage and testing
 if __name__ == "__main__":
     from poker_game import Card
@@ -333,7 +422,7 @@ if __name__ == "__main__":
     print("-" * 60)
     
     player_cards = [Card("Spades", "A"), Card("Hearts", "A")]
-    community = []
+    community: List[Card] = []
     
     result = calculator.calculate_win_probability(player_cards, community, 3)
     print(f"Player: AA")